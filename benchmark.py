@@ -0,0 +1,691 @@
+"""
+Benchmarks for the OCR and classification pipeline on the bundled dataset folders.
+
+Usage:
+    python benchmark.py preprocess [--limit N]
+    python benchmark.py quality [--limit N] [--threshold T]
+    python benchmark.py engines [--engines easyocr tesseract] [--limit N] [--accuracy]
+    python benchmark.py onnx [--limit N] [--threads N]
+    python benchmark.py quantize [--limit N]
+    python benchmark.py frames [--limit N] [--workers N] [--repeat N]
+    python benchmark.py importtime [--module classifier] [--top N] [--budget-ms MS]
+    python benchmark.py server [--url URL] [--endpoint /classify] [--concurrency N] [--limit N]
+    python benchmark.py batch [--limit N] [--batch-size N] [--max-padding F]
+"""
+
+import argparse
+import difflib
+import logging
+import multiprocessing
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BASE_PATH = Path(__file__).parent
+CATEGORIES = ["Bank Statement", "Check", "ITR_Form 16", "Salary Slip", "Utility"]
+
+# Images the README lists as unreadable (blurry or unclear scans)
+KNOWN_UNREADABLE = {
+    "Bank Statement": {"2", "98"},
+    "Check": {"1", "3", "4", "81", "83", "88"},
+    "ITR_Form 16": {"12", "14"},
+    "Salary Slip": {"43", "101"},
+    "Utility": {"1", "91"},
+}
+
+
+def list_dataset(base_path: Path = BASE_PATH, limit: int = None) -> List[Tuple[str, str]]:
+    """Return (image_path, category) for the dataset folders, optionally capped per folder."""
+    dataset = []
+    for category in CATEGORIES:
+        images = sorted((base_path / category).glob("*.jpg"), key=lambda p: p.name)
+        if limit:
+            images = images[:limit]
+        dataset.extend((str(image_path), category) for image_path in images)
+    return dataset
+
+
+def char_similarity(reference: str, candidate: str) -> float:
+    """Character-level similarity between two OCR outputs (1.0 = identical)."""
+    if not reference and not candidate:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference, candidate, autojunk=False).ratio()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_isolated(target, *args):
+    """
+    Run target(*args) in a fresh spawned process and return its result.
+    Used so per-configuration peak RSS is not polluted by earlier runs.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_isolated_entry, args=(results, target, args))
+    process.start()
+    outcome = results.get()
+    process.join()
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
+
+def _isolated_entry(results, target, args):
+    try:
+        results.put(target(*args))
+    except Exception as e:
+        results.put(e)
+
+
+def print_table(title: str, rows: List[Dict]):
+    """Print rows of {column: value} as an aligned table."""
+    print(f"\n{title}")
+    if not rows:
+        print("  (no rows)")
+        return
+    columns = list(rows[0].keys())
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def benchmark_preprocess(args):
+    """
+    Compare OCR at full resolution against text-height normalization.
+
+    For every image, OCR runs once without preprocessing and once with the
+    profile for its folder. Reports mean latency of each path and the
+    character similarity of the resized output to the full-resolution text.
+    """
+    from ocr_handler import ImageDecodeError, OCRHandler
+
+    dataset = list_dataset(limit=args.limit)
+    baseline = OCRHandler(languages=['en'])
+    handlers = {category: OCRHandler(languages=['en'], text_height_profile=category) for category in CATEGORIES}
+    # Share one engine so the comparison measures preprocessing, not model load
+    for handler in handlers.values():
+        handler.engine = baseline.engine
+
+    per_category = {category: {"images": 0, "full_s": 0.0, "resized_s": 0.0, "similarity": 0.0}
+                    for category in CATEGORIES}
+
+    skipped = 0
+    for image_path, category in dataset:
+        try:
+            image = baseline.load_image(image_path)
+        except ImageDecodeError:
+            skipped += 1
+            continue
+
+        started = time.perf_counter()
+        full_text, _ = baseline.extract_text_from_array(image)
+        full_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        resized_text, _ = handlers[category].extract_text_from_array(image)
+        resized_elapsed = time.perf_counter() - started
+
+        stats = per_category[category]
+        stats["images"] += 1
+        stats["full_s"] += full_elapsed
+        stats["resized_s"] += resized_elapsed
+        stats["similarity"] += char_similarity(full_text, resized_text)
+
+    rows = []
+    for category, stats in per_category.items():
+        if not stats["images"]:
+            continue
+        count = stats["images"]
+        rows.append({
+            "category": category,
+            "images": count,
+            "full_ms": stats["full_s"] / count * 1000,
+            "resized_ms": stats["resized_s"] / count * 1000,
+            "speedup": stats["full_s"] / stats["resized_s"] if stats["resized_s"] else 0.0,
+            "text_similarity": stats["similarity"] / count
+        })
+    print_table("Text height normalization (per image means)", rows)
+    if skipped:
+        print(f"\nSkipped {skipped} undecodable images")
+
+
+def benchmark_quality(args):
+    """
+    Score every image with the pre-OCR quality gate.
+
+    Compares the gate against the README's list of unreadable scans: how many
+    known-bad images it rejects, how many readable ones it wrongly rejects,
+    and how long scoring takes compared to the OCR it saves.
+    """
+    from config import QUALITY_CONFIG
+    from ocr_handler import ImageDecodeError, OCRHandler
+
+    threshold = args.threshold if args.threshold is not None else QUALITY_CONFIG["min_score"]
+    dataset = list_dataset(limit=args.limit)
+    # Include the known-bad images even when --limit would cut them off
+    listed = {path for path, _ in dataset}
+    for category, names in KNOWN_UNREADABLE.items():
+        for name in names:
+            path = BASE_PATH / category / f"{name}.jpg"
+            if path.exists() and str(path) not in listed:
+                dataset.append((str(path), category))
+
+    # assess_quality is a staticmethod, so no OCR engine is loaded
+    rows = []
+    elapsed = 0.0
+    skipped = 0
+    for image_path, category in dataset:
+        started = time.perf_counter()
+        try:
+            quality = OCRHandler.assess_quality(image_path)
+        except ImageDecodeError:
+            skipped += 1
+            continue
+        elapsed += time.perf_counter() - started
+        rows.append({
+            "image": f"{category}/{Path(image_path).name}",
+            "known_unreadable": Path(image_path).stem in KNOWN_UNREADABLE[category],
+            "score": quality["score"],
+            "sharpness": quality["sharpness"],
+            "contrast": quality["contrast"],
+            "text_height": quality["text_height"],
+            "glyphs": quality["glyphs"],
+            "rejected": quality["score"] < threshold
+        })
+
+    rows.sort(key=lambda row: row["score"])
+    print_table(f"Image quality scores (threshold {threshold:.2f})", rows)
+
+    bad = [row for row in rows if row["known_unreadable"]]
+    good = [row for row in rows if not row["known_unreadable"]]
+    print(f"\nKnown unreadable rejected: {sum(r['rejected'] for r in bad)}/{len(bad)}")
+    print(f"Readable wrongly rejected: {sum(r['rejected'] for r in good)}/{len(good)}")
+    print(f"Mean scoring time: {elapsed / len(rows) * 1000:.1f} ms/image")
+    if skipped:
+        print(f"Skipped {skipped} undecodable images")
+
+
+def _measure_engine(engine: str, limit: int, accuracy: bool) -> Dict:
+    """Throughput, peak RSS and optional downstream accuracy for one OCR engine."""
+    from ocr_handler import ImageDecodeError, OCRHandler
+
+    started = time.perf_counter()
+    handler = OCRHandler(languages=['en'], engine=engine)
+    load_s = time.perf_counter() - started
+
+    dataset = list_dataset(limit=limit)
+    pages = 0
+    skipped = 0
+    started = time.perf_counter()
+    for image_path, _ in dataset:
+        try:
+            handler.extract_text_from_image(image_path)
+        except ImageDecodeError:
+            skipped += 1
+            continue
+        pages += 1
+    elapsed = time.perf_counter() - started
+
+    row = {
+        "engine": engine,
+        "pages": pages,
+        "skipped": skipped,
+        "load_s": load_s,
+        "pages_per_s": pages / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "accuracy": "-"
+    }
+
+    if accuracy:
+        from classifier import DocumentClassifier
+        from evaluator import AccuracyMetric
+
+        metric = AccuracyMetric(random_seed=42)
+        test_set = metric.prepare_test_dataset(BASE_PATH, test_percentage=0.2)
+        classifier = DocumentClassifier(ocr_engine=engine)
+        row["accuracy"] = metric.evaluate(classifier, test_set)["accuracy"]
+    return row
+
+
+def benchmark_engines(args):
+    """
+    Compare OCR engines on the dataset folders.
+
+    Each engine runs in its own process so peak RSS reflects that engine
+    alone. With --accuracy, the AccuracyMetric test split is also classified
+    end to end with each engine (this makes LLM calls).
+    """
+    rows = [run_isolated(_measure_engine, engine, args.limit, args.accuracy) for engine in args.engines]
+    print_table("OCR engine comparison", rows)
+
+
+def benchmark_onnx(args):
+    """
+    Parity and latency of the ONNX Runtime engine against the Torch path.
+
+    Both engines OCR the same decoded images. Parity is reported against the
+    fp32 Torch reader (the ONNX graphs are exported from it) as exact text
+    match rate, character similarity and mean confidence difference; the
+    default (dynamically quantized) Torch reader is timed alongside.
+    """
+    import cv2
+    from ocr_engines import EasyOCREngine
+    from onnx_engine import OnnxEasyOCREngine
+
+    engines = {
+        "torch_default": EasyOCREngine(languages=['en']),
+        "torch_fp32": EasyOCREngine(languages=['en'], reader_options={"quantize": False}),
+        "onnx": OnnxEasyOCREngine(languages=['en'], intra_op_threads=args.threads),
+    }
+
+    timings = {name: 0.0 for name in engines}
+    exact, similarity, confidence_delta = 0, 0.0, 0.0
+    dataset = list_dataset(limit=args.limit)
+
+    count, skipped = 0, 0
+    for image_path, _ in dataset:
+        image = cv2.imread(image_path)
+        if image is None:
+            skipped += 1
+            continue
+        count += 1
+        results = {}
+        for name, engine in engines.items():
+            started = time.perf_counter()
+            results[name] = engine.extract(image)
+            timings[name] += time.perf_counter() - started
+
+        reference, candidate = results["torch_fp32"], results["onnx"]
+        exact += reference.text == candidate.text
+        similarity += char_similarity(reference.text, candidate.text)
+        confidence_delta += abs(reference.confidence - candidate.confidence)
+
+    if not count:
+        print("No decodable images")
+        return
+    print_table("OCR latency (per image means)", [
+        {"engine": name, "ms_per_page": total / count * 1000, "pages_per_s": count / total if total else 0.0}
+        for name, total in timings.items()
+    ])
+    print_table("ONNX vs Torch fp32 parity", [{
+        "pages": count,
+        "exact_text_match": exact / count,
+        "char_similarity": similarity / count,
+        "mean_confidence_delta": confidence_delta / count
+    }])
+    if skipped:
+        print(f"\nSkipped {skipped} undecodable images")
+
+
+def _measure_quantization(quantize: bool, limit: int) -> Dict:
+    """OCR the dataset with one quantization setting, in an isolated process."""
+    import torch
+    from ocr_handler import ImageDecodeError, OCRHandler
+
+    torch.set_num_threads(1)
+    baseline_rss = peak_rss_mb()
+    handler = OCRHandler(languages=['en'], quantize=quantize)
+    load_rss = peak_rss_mb()
+
+    # Decoding is deterministic, so both runs skip the same images and
+    # their texts stay aligned
+    texts = []
+    skipped = 0
+    dataset = list_dataset(limit=limit)
+    started = time.perf_counter()
+    for image_path, _ in dataset:
+        try:
+            texts.append(handler.extract_text_from_image(image_path)[0])
+        except ImageDecodeError:
+            skipped += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "model_rss_mb": load_rss - baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+        "pages_per_s": len(texts) / elapsed if elapsed else 0.0,
+        "texts": texts,
+        "skipped": skipped
+    }
+
+
+def benchmark_quantize(args):
+    """
+    Effect of int8 recognizer quantization on one OCR worker.
+
+    fp32 and int8 each run in a fresh single-threaded process (one worker's
+    footprint). There is no ground-truth text, so the character-level
+    accuracy delta is measured as int8 output similarity to fp32 output.
+    """
+    fp32 = run_isolated(_measure_quantization, False, args.limit)
+    int8 = run_isolated(_measure_quantization, True, args.limit)
+
+    similarities = [char_similarity(a, b) for a, b in zip(fp32["texts"], int8["texts"])]
+    rows = []
+    for name, stats in (("fp32", fp32), ("int8", int8)):
+        rows.append({
+            "mode": name,
+            "model_rss_mb": stats["model_rss_mb"],
+            "peak_rss_mb": stats["peak_rss_mb"],
+            "pages_per_s": stats["pages_per_s"]
+        })
+    print_table("Recognizer quantization (single worker, 1 torch thread)", rows)
+    print(f"\nPeak RSS reduction: {fp32['peak_rss_mb'] - int8['peak_rss_mb']:.1f} MB")
+    print(f"Throughput gain: {int8['pages_per_s'] / fp32['pages_per_s']:.2f}x" if fp32["pages_per_s"] else "")
+    print(f"Char similarity to fp32: mean {sum(similarities) / len(similarities):.4f}, "
+          f"min {min(similarities):.4f}" if similarities else "No pages processed")
+    if fp32["skipped"]:
+        print(f"Skipped {fp32['skipped']} undecodable images")
+
+
+def _frame_checksum(image) -> int:
+    return int(image[::64, ::64].sum())
+
+
+def _frame_checksum_shared(handle) -> int:
+    from shared_frames import attach_frame
+
+    image = attach_frame(handle)
+    try:
+        return _frame_checksum(image)
+    finally:
+        del image
+
+
+def benchmark_frames(args):
+    """
+    Hand-off cost of decoded frames to worker processes: pickled through the
+    executor queue vs. passed by FrameRing handle.
+
+    Workers only checksum a strided sample, so the timing is transport cost
+    rather than OCR.
+    """
+    import cv2
+    from concurrent.futures import ProcessPoolExecutor
+    from shared_frames import FrameRing
+
+    images = [image for image in (cv2.imread(path) for path, _ in list_dataset(limit=args.limit))
+              if image is not None]
+    images = images * args.repeat
+    total_mb = sum(image.nbytes for image in images) / 1024 / 1024
+    largest = max(image.nbytes for image in images)
+
+    rows = []
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # Warm the workers so process start-up is not timed
+        list(executor.map(_frame_checksum, images[:args.workers]))
+
+        started = time.perf_counter()
+        pickled = [future.result() for future in [executor.submit(_frame_checksum, image) for image in images]]
+        elapsed = time.perf_counter() - started
+        rows.append({"transport": "pickle", "frames": len(images), "MB": total_mb,
+                     "MB_per_s": total_mb / elapsed, "ms_per_frame": elapsed / len(images) * 1000})
+
+        with FrameRing(slots=2 * args.workers, slot_bytes=largest) as ring:
+            started = time.perf_counter()
+            futures = []
+            for image in images:
+                handle = ring.put(image)
+                future = executor.submit(_frame_checksum_shared, handle)
+                future.add_done_callback(lambda _, handle=handle: ring.release(handle))
+                futures.append(future)
+            shared = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+            leaked = len(ring.leaks())
+        rows.append({"transport": "shared_memory", "frames": len(images), "MB": total_mb,
+                     "MB_per_s": total_mb / elapsed, "ms_per_frame": elapsed / len(images) * 1000})
+
+    print_table(f"Frame hand-off ({args.workers} workers)", rows)
+    print(f"\nChecksums match: {pickled == shared}; unreleased slots: {leaked}")
+
+
+# Modules that must not load while importing the classifier package
+HEAVY_MODULES = ("torch", "easyocr", "cv2", "llama_index", "openai", "sklearn", "joblib", "onnxruntime")
+
+
+def measure_import_time(module: str = "classifier") -> List[Dict]:
+    """
+    Import module in a fresh interpreter under -X importtime.
+
+    Returns:
+        One {"module", "self_ms", "cumulative_ms", "depth"} row per imported
+        module, in the order the interpreter reports them
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_PATH,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            # Nested imports are indented by two spaces per level
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2
+        })
+    return rows
+
+
+def benchmark_importtime(args):
+    """
+    Cold-start cost of importing a module, parsed from python -X importtime.
+
+    Reports the total, the heaviest top-level imports, and any heavy
+    dependency that was loaded eagerly. With --budget-ms, exits non-zero when
+    the import exceeds the budget or pulls in a heavy module.
+    """
+    rows = measure_import_time(args.module)
+    # Rows are reported children-first; the module's own tree is the run of
+    # nested rows ending at its depth-0 row (interpreter start-up comes before)
+    end = next(idx for idx, row in enumerate(rows) if row["module"] == args.module and row["depth"] == 0)
+    start = end
+    while start > 0 and rows[start - 1]["depth"] > 0:
+        start -= 1
+    tree = rows[start:end + 1]
+    total = rows[end]["cumulative_ms"]
+
+    direct = sorted((row for row in tree if row["depth"] == 1), key=lambda row: row["cumulative_ms"], reverse=True)
+    print_table(f"Heaviest direct imports of '{args.module}'",
+                [{"module": row["module"], "cumulative_ms": row["cumulative_ms"], "self_ms": row["self_ms"]}
+                 for row in direct[:args.top]])
+
+    eager = sorted({row["module"].split(".")[0] for row in tree} & set(HEAVY_MODULES))
+    print(f"\nimport {args.module}: {total:.1f} ms, {len(tree)} modules")
+    print(f"Heavy modules loaded eagerly: {', '.join(eager) if eager else 'none'}")
+
+    if args.budget_ms is not None:
+        if total > args.budget_ms or eager:
+            print(f"FAIL: budget {args.budget_ms:.0f} ms")
+            sys.exit(1)
+        print(f"OK: within {args.budget_ms:.0f} ms budget")
+
+
+def benchmark_server(args):
+    """
+    Load-test a running server.py instance with the dataset images.
+
+    Posts every image from --concurrency client threads and reports request
+    throughput, latency percentiles and the server's mean OCR batch size.
+    """
+    import json
+    import urllib.error
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+
+    dataset = list_dataset(limit=args.limit)
+    bodies = [Path(path).read_bytes() for path, _ in dataset]
+
+    def post(body: bytes) -> Tuple[float, int]:
+        request = urllib.request.Request(args.url.rstrip("/") + args.endpoint, data=body,
+                                         headers={"Content-Type": "application/octet-stream"})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        results = list(executor.map(post, bodies))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status != 200)
+    with urllib.request.urlopen(args.url.rstrip("/") + "/stats") as response:
+        server_stats = json.loads(response.read())
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print_table(f"{args.endpoint} with {args.concurrency} concurrent clients", [{
+        "requests": len(results),
+        "errors": errors,
+        "req_per_s": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "max_ms": latencies[-1] * 1000,
+        "mean_ocr_batch": server_stats["ocr_batching"]["mean_batch_size"]
+    }] if latencies else [])
+
+
+def benchmark_batch(args):
+    """
+    Batched OCR (padded size buckets through readtext_batched) against
+    per-image extract_text_from_image on the same files.
+
+    Both paths share one handler without an OCR cache, so every page is
+    recognized twice. Reports pages/s, how many images actually landed in a
+    multi-image bucket, and the batched text's similarity to the per-image text.
+    """
+    from ocr_engines import size_buckets
+    from ocr_handler import ImageDecodeError, OCRHandler
+
+    dataset = list_dataset(limit=args.limit)
+    handler = OCRHandler(languages=['en'])
+
+    # Both paths must see the same pages, so drop the undecodable ones up front
+    image_paths, shapes = [], []
+    for image_path, _ in dataset:
+        try:
+            shapes.append(handler.load_image(image_path).shape)
+        except ImageDecodeError:
+            continue
+        image_paths.append(image_path)
+    skipped = len(dataset) - len(image_paths)
+    buckets = size_buckets(shapes, batch_size=args.batch_size, max_padding=args.max_padding)
+    batched = sum(len(bucket) for bucket in buckets if len(bucket) > 1)
+
+    started = time.perf_counter()
+    single_texts = [handler.extract_text_from_image(image_path)[0] for image_path in image_paths]
+    single_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_texts = []
+    for start in range(0, len(image_paths), args.chunk):
+        chunk = image_paths[start:start + args.chunk]
+        batch_texts.extend(text for text, _ in handler.extract_text_batch(chunk, batch_size=args.batch_size))
+    batch_elapsed = time.perf_counter() - started
+
+    rows = [
+        {"mode": "per-image", "pages": len(image_paths), "elapsed_s": single_elapsed,
+         "pages_per_s": len(image_paths) / single_elapsed if single_elapsed else 0.0},
+        {"mode": f"batched (batch_size={args.batch_size})", "pages": len(image_paths), "elapsed_s": batch_elapsed,
+         "pages_per_s": len(image_paths) / batch_elapsed if batch_elapsed else 0.0}
+    ]
+    print_table("Batched vs per-image OCR", rows)
+    similarities = [char_similarity(a, b) for a, b in zip(single_texts, batch_texts)]
+    print(f"\n{len(image_paths)} images, {len(set(shapes))} distinct shapes, {len(buckets)} size buckets "
+          f"({batched} images in multi-image buckets)")
+    print(f"Speedup: {single_elapsed / batch_elapsed:.2f}x" if batch_elapsed else "")
+    print(f"Char similarity to per-image: mean {sum(similarities) / len(similarities):.4f}, "
+          f"min {min(similarities):.4f}" if similarities else "No pages processed")
+    if skipped:
+        print(f"Skipped {skipped} undecodable images")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    preprocess = subparsers.add_parser("preprocess", help="Latency/accuracy effect of text height resizing")
+    preprocess.add_argument("--limit", type=int, default=None, help="Max images per folder")
+    preprocess.set_defaults(func=benchmark_preprocess)
+
+    quality = subparsers.add_parser("quality", help="Quality gate scores vs. known unreadable scans")
+    quality.add_argument("--limit", type=int, default=None, help="Max images per folder")
+    quality.add_argument("--threshold", type=float, default=None, help="Override QUALITY_CONFIG min_score")
+    quality.set_defaults(func=benchmark_quality)
+
+    engines = subparsers.add_parser("engines", help="Pages/s, peak RSS and accuracy per OCR engine")
+    engines.add_argument("--engines", nargs="+", default=["easyocr", "tesseract"], help="Engines to compare")
+    engines.add_argument("--limit", type=int, default=None, help="Max images per folder")
+    engines.add_argument("--accuracy", action="store_true", help="Also run AccuracyMetric (uses the LLM)")
+    engines.set_defaults(func=benchmark_engines)
+
+    onnx = subparsers.add_parser("onnx", help="ONNX Runtime vs Torch parity and latency")
+    onnx.add_argument("--limit", type=int, default=None, help="Max images per folder")
+    onnx.add_argument("--threads", type=int, default=None, help="onnxruntime intra-op threads")
+    onnx.set_defaults(func=benchmark_onnx)
+
+    quantize = subparsers.add_parser("quantize", help="Int8 recognizer: memory, throughput, text delta")
+    quantize.add_argument("--limit", type=int, default=None, help="Max images per folder")
+    quantize.set_defaults(func=benchmark_quantize)
+
+    frames = subparsers.add_parser("frames", help="Decoded frame hand-off: pickle vs shared memory")
+    frames.add_argument("--limit", type=int, default=10, help="Max images per folder")
+    frames.add_argument("--workers", type=int, default=2, help="Worker processes")
+    frames.add_argument("--repeat", type=int, default=3, help="Times each image is sent")
+    frames.set_defaults(func=benchmark_frames)
+
+    importtime = subparsers.add_parser("importtime", help="Cold-start import cost from python -X importtime")
+    importtime.add_argument("--module", default="classifier", help="Module to import")
+    importtime.add_argument("--top", type=int, default=15, help="Number of direct imports to list")
+    importtime.add_argument("--budget-ms", type=float, default=None, help="Fail if the import takes longer")
+    importtime.set_defaults(func=benchmark_importtime)
+
+    server = subparsers.add_parser("server", help="Load-test a running server.py instance")
+    server.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    server.add_argument("--endpoint", default="/classify", help="/classify or /extract?ocr_only=1")
+    server.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads")
+    server.add_argument("--limit", type=int, default=10, help="Max images per folder")
+    server.set_defaults(func=benchmark_server)
+
+    batch = subparsers.add_parser("batch", help="Batched OCR (padded size buckets) vs per-image pages/s")
+    batch.add_argument("--limit", type=int, default=10, help="Max images per folder")
+    batch.add_argument("--batch-size", type=int, default=8, help="Max images per readtext_batched call")
+    batch.add_argument("--max-padding", type=float, default=0.25, help="Max padded area fraction per bucket")
+    batch.add_argument("--chunk", type=int, default=64, help="Images handed to extract_text_batch at a time")
+    batch.set_defaults(func=benchmark_batch)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,154 @@
+import asyncio
 import logging
-from typing import Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from pathlib import Path
+import numpy as np
 from llm_classifier import LLMClassifier
-from ocr_handler import OCRHandler
-from extraction_schema import DocumentExtraction
-from llama_index.core.program import LLMTextCompletionProgram
-from ocr_handler import OCRHandler
+from keyword_classifier import KeywordClassifier
+from text_model import TextModelClassifier
+from ocr_engines import OCRResult
+from ocr_handler import ImageSource, OCRHandler, describe_source
 from dotenv import load_dotenv
+if TYPE_CHECKING:
+    from extraction_schema import DocumentExtraction
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# In-process OCRHandler settings that an OCRPool configures on its own workers
+_OCR_DEFAULTS = {
+    "gpu": False,
+    "cache": None,
+    "text_height_profile": None,
+    "decode_mode": "color",
+    "engine": None,
+    "quantize": None
+}
+
 class DocumentClassifier:
     """
     Main document classifier that handles both image and text input.
     Orchestrates OCR, LLM classification, and confidence scoring.
+    
+    The OCR engine and the LLM client are created on first use, so text-only
+    callers never load the OCR models; call warm_up() to load both up front.
     """
     
-    def __init__(self, api_key: str = None, ocr_gpu: bool = False):
+    def __init__(
+        self,
+        api_key: str = None,
+        ocr_gpu: bool = False,
+        ocr_pool=None,
+        ocr_cache=None,
+        llm_cache=None,
+        llm_concurrency: int = 8,
+        ocr_workers: int = 1,
+        fast_path: bool = False,
+        text_model=None,
+        ocr_text_height_profile: str = None,
+        ocr_decode_mode: str = "color",
+        progressive: bool = False,
+        header_fraction: float = 0.33,
+        progressive_threshold: float = 0.75,
+        quality_threshold: float = None,
+        ocr_engine: str = None,
+        ocr_quantize: bool = None
+    ):
         """
         Initialize the unified document classifier.
         
         Args:
             api_key: OpenAI API key (uses OPENAI_API_KEY env var if not provided)
             ocr_gpu: Whether to use GPU for OCR (default: False)
+            ocr_pool: Optional OCRPool; when given, OCR runs in its worker
+                      processes instead of an in-process OCRHandler. The ocr_*
+                      options below are then configured on the pool instead,
+                      and passing them here raises ValueError
+            ocr_cache: Optional OCRCache shared by the in-process OCRHandler
+            llm_cache: Optional LLMResponseCache for classification prompts
+            llm_concurrency: Max in-flight LLM calls for the async API (default: 8)
+            ocr_workers: Executor threads running OCR for the async API (default: 1)
+            fast_path: Classify clear-cut documents with local keyword scoring
+                       and only call the LLM when scores are ambiguous (default: False)
+            text_model: Optional TextModelClassifier (or path to a saved one) tried
+                        first; only low-margin documents go on to the LLM
+            ocr_text_height_profile: Text height profile for pre-OCR downsampling
+                                     (see config.TEXT_HEIGHT_PROFILES; default: off)
+            ocr_decode_mode: "color" or "reduced_gray" JPEG decode (default: "color")
+            progressive: In classify_image, OCR and classify the header band first and
+                         only OCR the rest of the page when the combined confidence
+                         is below progressive_threshold (default: False)
+            header_fraction: Share of the page height treated as header (default: 0.33)
+            progressive_threshold: Combined (classification x OCR) confidence needed to
+                                   stop after the header (default: 0.75)
+            quality_threshold: Minimum image quality score (0-1); lower-scoring scans
+                               return "unknown" without OCR or LLM calls
+                               (default: None = off; config.QUALITY_CONFIG["min_score"]
+                               is the suggested value)
+            ocr_engine: OCR engine name, "easyocr" or "tesseract"
+                        (default: config.OCR_CONFIG["engine"])
+            ocr_quantize: Int8 recognizer quantization for EasyOCR (see OCRHandler)
         """
-        self.llm_classifier = LLMClassifier(api_key=api_key)
-        self.ocr_handler = OCRHandler(languages=['en'], gpu=ocr_gpu)
+        self._ocr_options = {
+            "languages": ['en'],
+            "gpu": ocr_gpu,
+            "cache": ocr_cache,
+            "text_height_profile": ocr_text_height_profile,
+            "decode_mode": ocr_decode_mode,
+            "engine": ocr_engine,
+            "quantize": ocr_quantize
+        }
+        if ocr_pool is not None:
+            # The pool's workers are already configured; these would be silently ignored
+            ignored = [f"ocr_{name}" for name, value in self._ocr_options.items()
+                       if name != "languages" and value != _OCR_DEFAULTS[name]]
+            if ignored:
+                raise ValueError(f"{', '.join(ignored)} cannot be combined with ocr_pool; "
+                                 f"pass the equivalent OCRPool arguments instead")
+        self.llm_classifier = LLMClassifier(api_key=api_key, cache=llm_cache)
+        self._ocr_handler = ocr_pool
+        self._ocr_lock = threading.Lock()
+        self.llm_concurrency = llm_concurrency
+        self.ocr_workers = ocr_workers
+        self._ocr_executor = None
+        self.keyword_classifier = KeywordClassifier() if fast_path else None
+        if isinstance(text_model, (str, Path)):
+            text_model = TextModelClassifier.load(text_model)
+        self.text_model = text_model
+        self.progressive = progressive
+        self.header_fraction = header_fraction
+        self.progressive_threshold = progressive_threshold
+        self.quality_threshold = quality_threshold
+        self.routing_stats = {"keyword": 0, "llm": 0, "quality_gate": 0}
+        self.ocr_path_stats = {"header": 0, "full": 0}
+        self._stats_lock = threading.Lock()
         logger.info("DocumentClassifier initialized with OCR and LLM components")
     
-    def classify_image(self, image_path: str) -> Dict:
+    @property
+    def ocr_handler(self):
+        """The OCRPool passed in, or an in-process OCRHandler created on first use."""
+        if self._ocr_handler is None:
+            with self._ocr_lock:
+                if self._ocr_handler is None:
+                    self._ocr_handler = OCRHandler(**self._ocr_options)
+        return self._ocr_handler
+    
+    @ocr_handler.setter
+    def ocr_handler(self, handler):
+        self._ocr_handler = handler
+    
+    def warm_up(self) -> "DocumentClassifier":
+        """Load the OCR engine and the LLM client now instead of on first use."""
+        _ = self.ocr_handler
+        _ = self.llm_classifier.llm
+        return self
+    
+    def classify_image(self, image_path: ImageSource) -> Dict:
         """
-        Classify a document from an image file.
+        Classify a document from an image file, encoded image bytes
+        (bytes/memoryview, e.g. an upload) or a decoded BGR array.
         Orchestrates OCR extraction and LLM classification.
         
         Steps :
@@ -39,32 +156,29 @@ class DocumentClassifier:
             2. Classify the extracted text using LLM
             3. Parse LLM response
         """
-        image_path = Path(image_path)
+        image_path = self._resolve_source(image_path)
         
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+        rejected = self.check_quality(image_path)
+        if rejected is not None:
+            return rejected
+        
+        if self.progressive:
+            return self._classify_image_progressive(image_path)
         
         try:
-            logger.info(f"Starting classification pipeline for: {image_path}")
+            logger.info(f"Starting classification pipeline for: {describe_source(image_path)}")
             logger.info("Step 1: Extracting text from image using OCR")
-            extracted_text, ocr_confidence = self.ocr_handler.extract_text_from_image(
-                image_path=str(image_path)
-            )
+            extracted_text, ocr_confidence = self.ocr_handler.extract_text_from_image(image_path=image_path)
             
             if not extracted_text or not extracted_text.strip():
-                logger.warning(f"No text extracted from image: {image_path}")
-                return {
-                    "document_type": "unknown",
-                    "confidence": 0.0,
-                    "reasoning": "No text could be extracted from the image",
-                    "key_indicators": [],
-                    "negative_indicators": [],
-                    "ocr_confidence": ocr_confidence,
-                    "combined_confidence": 0.0,
-                    "error": "Empty OCR result"
-                }
+                logger.warning(f"No text extracted from image: {describe_source(image_path)}")
+                return self.empty_ocr_result(ocr_confidence)
             
             logger.info(f"OCR extraction successful. Confidence: {ocr_confidence:.2f}")
+            local_response = self.classify_locally(extracted_text)
+            if local_response is not None:
+                return local_response
+            
             logger.info("Step 2: Classifying extracted text using LLM")
             llm_response = self.llm_classifier.classify_text(text=extracted_text)
             logger.info("Step 3: Parsing LLM response")
@@ -74,6 +188,377 @@ class DocumentClassifier:
             logger.error(f"Error in classification pipeline: {str(e)}")
             raise
     
+    def classify_image_with_ocr(self, image_path: ImageSource) -> Tuple[Dict, Optional[OCRResult]]:
+        """
+        Classify an image and also return the OCRResult behind the decision,
+        so layout-aware consumers (result.lines(), the boxes) reuse this OCR
+        pass instead of running a second one.
+        
+        The whole page is always read, so progressive early exit does not
+        apply, and the text-only OCR cache is bypassed.
+        
+        Returns:
+            (classification result, OCRResult with boxes in source image
+            coordinates); the OCRResult is None when the quality gate
+            rejected the image
+        """
+        image_path = self._resolve_source(image_path)
+        rejected = self.check_quality(image_path)
+        if rejected is not None:
+            return rejected, None
+        
+        try:
+            logger.info(f"Starting classification pipeline for: {describe_source(image_path)}")
+            ocr_result = self.ocr_handler.extract_result(image_path)
+            if not len(ocr_result):
+                logger.warning(f"No text extracted from image: {describe_source(image_path)}")
+            return self.classify_ocr_text(ocr_result.text, ocr_result.confidence), ocr_result
+            
+        except Exception as e:
+            logger.error(f"Error in classification pipeline: {str(e)}")
+            raise
+    
+    def _classify_image_progressive(self, image_path: ImageSource) -> Dict:
+        """
+        Header-first classification with early exit.
+        
+        Steps :
+            1. OCR the top header_fraction of the page and classify it
+            2. Stop if classification confidence x OCR confidence clears the threshold
+            3. Otherwise OCR the remainder and classify the full text
+        
+        The header goes through the same tiers as the full page, so when it is
+        inconclusive and the local tiers abstain the document costs two LLM
+        calls (header, then full text). routing_stats counts each document
+        once, under the route of the result returned.
+        
+        The result carries ocr_path ("header" or "full") and combined_confidence.
+        """
+        try:
+            logger.info(f"Starting progressive classification for: {describe_source(image_path)}")
+            read_band = self._band_reader(image_path)
+            
+            header_text, header_confidence = read_band(*self._header_band())
+            if header_text.strip():
+                response = self._classify_extracted_text(header_text, record=False)
+                accepted = self._accept_header(response, header_confidence)
+                if accepted is not None:
+                    return accepted
+            
+            logger.info("Header inconclusive, running OCR on the rest of the page")
+            body_text, body_confidence = read_band(self.header_fraction, 1.0)
+            full_text, ocr_confidence = self._merge_bands(header_text, header_confidence, body_text, body_confidence)
+            if not full_text.strip():
+                logger.warning(f"No text extracted from image: {describe_source(image_path)}")
+                return self._record_ocr_path(self.empty_ocr_result(ocr_confidence), "full", ocr_confidence, 0.0)
+            
+            response = self._classify_extracted_text(full_text, record=False)
+            return self._accept_full(response, ocr_confidence)
+            
+        except Exception as e:
+            logger.error(f"Error in classification pipeline: {str(e)}")
+            raise
+    
+    async def _aclassify_image_progressive(self, image_path: ImageSource, semaphore: asyncio.Semaphore = None) -> Dict:
+        """Async variant of _classify_image_progressive; OCR runs in the OCR executor."""
+        try:
+            logger.info(f"Starting progressive classification for: {describe_source(image_path)}")
+            loop = asyncio.get_running_loop()
+            executor = self._get_ocr_executor()
+            read_band = await loop.run_in_executor(executor, self._band_reader, image_path)
+            
+            header_text, header_confidence = await loop.run_in_executor(executor, read_band, *self._header_band())
+            if header_text.strip():
+                response = await self._aclassify_extracted_text(header_text, semaphore, record=False)
+                accepted = self._accept_header(response, header_confidence)
+                if accepted is not None:
+                    return accepted
+            
+            logger.info("Header inconclusive, running OCR on the rest of the page")
+            body_text, body_confidence = await loop.run_in_executor(executor, read_band, self.header_fraction, 1.0)
+            full_text, ocr_confidence = self._merge_bands(header_text, header_confidence, body_text, body_confidence)
+            if not full_text.strip():
+                logger.warning(f"No text extracted from image: {describe_source(image_path)}")
+                return self._record_ocr_path(self.empty_ocr_result(ocr_confidence), "full", ocr_confidence, 0.0)
+            
+            response = await self._aclassify_extracted_text(full_text, semaphore, record=False)
+            return self._accept_full(response, ocr_confidence)
+            
+        except Exception as e:
+            logger.error(f"Error in classification pipeline: {str(e)}")
+            raise
+    
+    def _band_reader(self, image_path: ImageSource):
+        """
+        Return read(start, stop) -> (text, confidence) for horizontal bands of
+        the page, with start/stop as fractions of its height.
+        
+        An in-process OCRHandler reads each band from the encoded bytes, so
+        bands are cached per image and band; arrays and OCRPool handlers
+        decode the page once here and OCR slices of it.
+        """
+        handler = self.ocr_handler
+        if not isinstance(image_path, np.ndarray) and hasattr(handler, "extract_text_from_band"):
+            return lambda start, stop: handler.extract_text_from_band(image_path, start, stop)
+        
+        image = image_path if isinstance(image_path, np.ndarray) else handler.load_image(image_path)
+        height = image.shape[0]
+        return lambda start, stop: handler.extract_text_from_array(image[int(height * start):int(height * stop)])
+    
+    def _header_band(self) -> Tuple[float, float]:
+        """Header rows; they overlap the body slightly so a line cut by the split is read whole."""
+        return 0.0, min(1.0, self.header_fraction + 0.02)
+    
+    def _accept_header(self, response: Dict, header_confidence: float) -> Optional[Dict]:
+        """The header result if it clears progressive_threshold, otherwise None."""
+        combined = float(response.get("confidence", 0.0)) * header_confidence
+        if response.get("document_type", "unknown") == "unknown" or combined < self.progressive_threshold:
+            return None
+        logger.info(f"Header classification accepted (combined confidence {combined:.2f})")
+        self._record_route(response.get("classified_by", "llm"))
+        return self._record_ocr_path(response, "header", header_confidence, combined)
+    
+    def _accept_full(self, response: Dict, ocr_confidence: float) -> Dict:
+        """Record and annotate the full-page result."""
+        self._record_route(response.get("classified_by", "llm"))
+        combined = float(response.get("confidence", 0.0)) * ocr_confidence
+        return self._record_ocr_path(response, "full", ocr_confidence, combined)
+    
+    @staticmethod
+    def _merge_bands(header_text: str, header_confidence: float, body_text: str, body_confidence: float) -> Tuple[str, float]:
+        """Full page text and its OCR confidence, weighting each band by how much text it produced."""
+        full_text = "\n".join(part for part in (header_text, body_text) if part.strip())
+        weights = (len(header_text), len(body_text))
+        ocr_confidence = (
+            (header_confidence * weights[0] + body_confidence * weights[1]) / sum(weights)
+            if sum(weights) else 0.0
+        )
+        return full_text, ocr_confidence
+    
+    def check_quality(self, image_path: ImageSource) -> Optional[Dict]:
+        """
+        Run the pre-OCR quality gate.
+        
+        Returns:
+            An "unknown" result with a low_quality error if the scan scores below
+            quality_threshold, otherwise None
+        """
+        if self.quality_threshold is None:
+            return None
+        
+        quality = self.ocr_handler.assess_quality(image_path)
+        if quality["score"] >= self.quality_threshold:
+            return None
+        
+        logger.warning(f"Skipping low quality image {describe_source(image_path)} (score {quality['score']:.2f})")
+        with self._stats_lock:
+            self.routing_stats["quality_gate"] += 1
+        return {
+            "document_type": "unknown",
+            "confidence": 0.0,
+            "reasoning": f"Image quality score {quality['score']:.2f} is below the threshold "
+                         f"{self.quality_threshold:.2f}; the scan is too blurry or faint to read",
+            "key_indicators": [],
+            "negative_indicators": [],
+            "ocr_confidence": 0.0,
+            "combined_confidence": 0.0,
+            "error": "low_quality",
+            "quality": quality,
+            "classified_by": "quality_gate"
+        }
+    
+    def _classify_extracted_text(self, text: str, llm_slots: threading.Semaphore = None, record: bool = True) -> Dict:
+        """Classify OCR text through the local tiers, then the LLM."""
+        local_response = self.classify_locally(text, record=record)
+        if local_response is not None:
+            return local_response
+        if llm_slots is None:
+            return self.llm_classifier.classify_text(text=text)
+        with llm_slots:
+            return self.llm_classifier.classify_text(text=text)
+    
+    def classify_ocr_text(self, text: str, ocr_confidence: float, llm_slots: threading.Semaphore = None) -> Dict:
+        """
+        Classify text that OCR has already produced elsewhere (a batched OCR
+        call, a pipeline stage), exactly as classify_image would after its
+        own OCR step.
+        
+        Args:
+            text: OCR text; blank text returns the empty OCR result
+            ocr_confidence: Mean OCR confidence, added to the result
+            llm_slots: Optional semaphore bounding concurrent LLM calls
+        """
+        if not text or not text.strip():
+            return self.empty_ocr_result(ocr_confidence)
+        response = dict(self._classify_extracted_text(text, llm_slots))
+        response["ocr_confidence"] = ocr_confidence
+        return response
+    
+    async def _aclassify_extracted_text(self, text: str, semaphore: asyncio.Semaphore = None, record: bool = True) -> Dict:
+        """Async variant of _classify_extracted_text."""
+        local_response = self.classify_locally(text, record=record)
+        if local_response is not None:
+            return local_response
+        if semaphore is None:
+            return await self.llm_classifier.aclassify_text(text=text)
+        async with semaphore:
+            return await self.llm_classifier.aclassify_text(text=text)
+    
+    def _record_ocr_path(self, response: Dict, path: str, ocr_confidence: float, combined: float) -> Dict:
+        """Annotate a progressive result with the OCR path taken and count it."""
+        response = dict(response)
+        response["ocr_path"] = path
+        response["ocr_confidence"] = ocr_confidence
+        response["combined_confidence"] = combined
+        with self._stats_lock:
+            self.ocr_path_stats[path] += 1
+        return response
+    
+    async def aclassify_image(self, image_path: ImageSource, semaphore: asyncio.Semaphore = None) -> Dict:
+        """
+        Async variant of classify_image.
+        OCR runs in an executor so the event loop stays free to drive LLM
+        calls for other documents while this one is being read.
+        
+        Args:
+            image_path: Image file path, encoded bytes or decoded array
+            semaphore: Optional semaphore bounding concurrent LLM calls
+        """
+        image_path = self._resolve_source(image_path)
+        
+        try:
+            loop = asyncio.get_running_loop()
+            if self.quality_threshold is not None:
+                rejected = await loop.run_in_executor(self._get_ocr_executor(), self.check_quality, image_path)
+                if rejected is not None:
+                    return rejected
+            
+            if self.progressive:
+                return await self._aclassify_image_progressive(image_path, semaphore)
+            
+            extracted_text, ocr_confidence = await loop.run_in_executor(
+                self._get_ocr_executor(),
+                self.ocr_handler.extract_text_from_image,
+                image_path
+            )
+            
+            if not extracted_text or not extracted_text.strip():
+                logger.warning(f"No text extracted from image: {describe_source(image_path)}")
+                return self.empty_ocr_result(ocr_confidence)
+            
+            return await self._aclassify_extracted_text(extracted_text, semaphore)
+            
+        except Exception as e:
+            logger.error(f"Error in classification pipeline: {str(e)}")
+            raise
+    
+    async def aclassify_many(
+        self,
+        image_paths: List[str],
+        concurrency: int = None,
+        return_exceptions: bool = False
+    ) -> List[Dict]:
+        """
+        Classify several images concurrently, overlapping OCR with LLM calls.
+        
+        Args:
+            image_paths: Image file paths
+            concurrency: Max in-flight LLM calls (default: llm_concurrency)
+            return_exceptions: Return per-image exceptions instead of raising
+            
+        Returns:
+            Results in the same order as image_paths
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.llm_concurrency)
+        tasks = [self.aclassify_image(path, semaphore=semaphore) for path in image_paths]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    
+    def classify_locally(self, text: str, record: bool = True) -> Optional[Dict]:
+        """
+        Try the local tiers before the LLM: the trained text model first,
+        then keyword scoring. Records which route the document took in
+        routing_stats.
+        
+        Args:
+            text: Document text
+            record: Count the route in routing_stats; callers that classify
+                    one document more than once record the final route
+                    themselves (default: True)
+        
+        Returns:
+            Local classification result, or None if the LLM is needed
+        """
+        response = None
+        if self.text_model is not None:
+            response = self.text_model.classify(text)
+        if response is None and self.keyword_classifier is not None:
+            response = self.keyword_classifier.classify(text)
+        
+        if record:
+            self._record_route(response["classified_by"] if response is not None else "llm")
+        return response
+    
+    def _record_route(self, route: str):
+        with self._stats_lock:
+            self.routing_stats[route] = self.routing_stats.get(route, 0) + 1
+    
+    def routing_report(self) -> Dict:
+        """
+        Counts per route and the fraction of documents that skipped the LLM,
+        plus how many progressive classifications stopped at the header.
+        """
+        with self._stats_lock:
+            counts = dict(self.routing_stats)
+            ocr_paths = dict(self.ocr_path_stats)
+        total = sum(counts.values())
+        local = total - counts.get("llm", 0)
+        return {
+            "counts": counts,
+            "total": total,
+            "short_circuited": local,
+            "short_circuit_rate": local / total if total else 0.0,
+            "ocr_paths": ocr_paths
+        }
+    
+    @staticmethod
+    def _resolve_source(image_path: ImageSource) -> ImageSource:
+        """Check that a path exists; in-memory bytes and arrays pass through unchanged."""
+        if isinstance(image_path, (bytes, bytearray, memoryview, np.ndarray)):
+            return image_path
+        image_path = Path(image_path)
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        return str(image_path)
+    
+    def _get_ocr_executor(self) -> ThreadPoolExecutor:
+        """Create the OCR executor on first async use."""
+        if self._ocr_executor is None:
+            self._ocr_executor = ThreadPoolExecutor(
+                max_workers=self.ocr_workers,
+                thread_name_prefix="ocr"
+            )
+        return self._ocr_executor
+    
+    def close(self):
+        """Shut down the OCR executor started by the async API, if any."""
+        executor, self._ocr_executor = self._ocr_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    @staticmethod
+    def empty_ocr_result(ocr_confidence: float) -> Dict:
+        """Result returned when OCR produced no usable text."""
+        return {
+            "document_type": "unknown",
+            "confidence": 0.0,
+            "reasoning": "No text could be extracted from the image",
+            "key_indicators": [],
+            "negative_indicators": [],
+            "ocr_confidence": ocr_confidence,
+            "combined_confidence": 0.0,
+            "error": "Empty OCR result"
+        }
+    
     def classify_text(self, text: str) -> Dict:
         """
         Classify a document based on text content directly.
@@ -99,6 +584,10 @@ class DocumentClassifier:
                     "combined_confidence": 0.0,
                     "error": "Empty OCR result"
                 }            
+            local_response = self.classify_locally(text)
+            if local_response is not None:
+                return local_response
+            
             # Classify using LLM
             llm_response = self.llm_classifier.classify_text(text=text)
             
@@ -110,10 +599,13 @@ class DocumentClassifier:
             logger.error(f"Error in text classification: {str(e)}")
             raise
 
-    def extract_schema_from_text(self, ocr_text: str) -> DocumentExtraction:
+    def extract_schema_from_text(self, ocr_text: str) -> "DocumentExtraction":
         """
         Convert OCR text to structured data using LLM
         """
+        from llama_index.core.program import LLMTextCompletionProgram
+        from extraction_schema import DocumentExtraction
+        
         prompt_template = f"""
         You are extracting information from a OCR Text:
         {ocr_text}
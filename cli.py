@@ -0,0 +1,200 @@
+"""
+Batch command line interface.
+Classifies or extracts whole directories (or globs) of document images and
+streams one JSONL line per document as it finishes.
+
+Usage:
+    python cli.py classify "Bank Statement" Check --output results.jsonl
+    python cli.py classify "*/1*.jpg" --ocr-workers 4 --llm-concurrency 16
+    python cli.py extract "Salary Slip" --output extracted.jsonl --resume
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from journal import end_with_newline, load_completed
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+def collect_images(inputs: List[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into image paths.
+    Order is stable and duplicates are dropped.
+    """
+    paths = []
+    for pattern in inputs:
+        matches = [Path(match) for match in sorted(glob.glob(pattern, recursive=True))] or [Path(pattern)]
+        for match in matches:
+            if match.is_dir():
+                paths.extend(sorted(path for path in match.rglob("*")
+                                    if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES))
+            elif match.is_file():
+                paths.append(match)
+            else:
+                logger.warning(f"No images match {pattern}")
+    return list(dict.fromkeys(str(path) for path in paths))
+
+
+def _open_output(output: str, resume: bool):
+    """Open the JSONL sink: stdout, or a file appended to when resuming."""
+    if output is None:
+        return sys.stdout
+    if resume:
+        end_with_newline(Path(output))
+        return open(output, "a", encoding="utf-8")
+    return open(output, "w", encoding="utf-8")
+
+
+def build_classifier(args):
+    """DocumentClassifier (with an OCRPool when --ocr-workers > 1) for the CLI options."""
+    from dotenv import load_dotenv
+    from classifier import DocumentClassifier
+
+    load_dotenv()
+    ocr_pool = None
+    if args.ocr_workers > 1:
+        from ocr_pool import OCRPool
+        ocr_pool = OCRPool(workers=args.ocr_workers, engine=args.ocr_engine)
+
+    # The pipeline OCRs decoded arrays, which the (bytes-keyed) OCR cache does not cover
+    llm_cache = None
+    if args.llm_cache:
+        from llm_cache import LLMResponseCache
+        llm_cache = LLMResponseCache()
+
+    return DocumentClassifier(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        ocr_pool=ocr_pool,
+        llm_cache=llm_cache,
+        llm_concurrency=args.llm_concurrency,
+        fast_path=args.fast_path,
+        text_model=args.text_model,
+        ocr_engine=args.ocr_engine if ocr_pool is None else None
+    )
+
+
+def run(args) -> Dict:
+    """
+    Process every image for the chosen command and stream results.
+
+    Steps :
+        1. Expand inputs and drop images already in the output file (--resume)
+        2. Run decode -> OCR -> LLM through ClassificationPipeline
+        3. Write one JSONL line per document as it completes
+
+    Returns:
+        Throughput summary
+    """
+    from pipeline import ClassificationPipeline
+
+    image_paths = collect_images(args.inputs)
+    skipped = 0
+    if args.resume:
+        completed = load_completed(Path(args.output), "result")
+        skipped = sum(1 for path in image_paths if path in completed)
+        image_paths = [path for path in image_paths if path not in completed]
+    logger.info(f"{len(image_paths)} images to {args.command} ({skipped} already done)")
+
+    classifier = build_classifier(args)
+    process_text = None
+    if args.command == "extract":
+        def process_text(text: str) -> Dict:
+            return classifier.extract_schema_from_text(ocr_text=text).model_dump()
+    pipeline = ClassificationPipeline(
+        classifier,
+        decode_workers=2,
+        ocr_workers=args.ocr_workers,
+        llm_workers=args.llm_concurrency,
+        queue_size=max(8, 2 * args.ocr_workers),
+        process_text=process_text
+    )
+
+    sink = _open_output(args.output, args.resume)
+    processed = errors = 0
+    started = time.perf_counter()
+    try:
+        for item in pipeline.run(image_paths):
+            sink.write(json.dumps(item, default=str) + "\n")
+            sink.flush()
+            processed += 1
+            errors += item["error"] is not None
+            if processed % 10 == 0:
+                elapsed = time.perf_counter() - started
+                print(f"[{processed}/{len(image_paths)}] {processed / elapsed:.2f} docs/s", file=sys.stderr)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+        # The ocr_handler property would build (and load) an OCRHandler just to
+        # check it; only an OCRPool from build_classifier needs shutting down
+        ocr_handler = classifier._ocr_handler
+        if hasattr(ocr_handler, "shutdown"):
+            ocr_handler.shutdown()
+        classifier.close()
+
+    elapsed = time.perf_counter() - started
+    stages = pipeline.stats()
+    return {
+        "command": args.command,
+        "processed": processed,
+        "errors": errors,
+        "skipped": skipped,
+        "elapsed_s": elapsed,
+        "docs_per_s": processed / elapsed if elapsed else 0.0,
+        "stage_busy_s": {name: stats["busy_seconds"] for name, stats in stages.items() if isinstance(stats, dict)},
+        "routing": classifier.routing_report()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("classify", "Classify document images"),
+                            ("extract", "Extract schema fields from document images")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+        command.add_argument("--output", "-o", default=None, help="JSONL output file (default: stdout)")
+        command.add_argument("--resume", action="store_true",
+                             help="Skip images already written successfully to --output")
+        command.add_argument("--ocr-workers", type=int, default=1,
+                             help="OCR worker processes; 1 runs OCR in this process (default: 1)")
+        command.add_argument("--llm-concurrency", type=int, default=8, help="Max in-flight LLM calls (default: 8)")
+        command.add_argument("--ocr-engine", default=None, help="OCR engine (default: config.OCR_CONFIG)")
+        command.add_argument("--llm-cache", action="store_true", help="Use the persistent LLM response cache")
+        command.add_argument("--fast-path", action="store_true", help="Keyword fast path before the LLM")
+        command.add_argument("--text-model", default=None, help="Saved TextModelClassifier to try before the LLM")
+        command.add_argument("--verbose", "-v", action="store_true", help="Show per-document INFO logs")
+
+    args = parser.parse_args()
+    if args.ocr_workers < 1 or args.llm_concurrency < 1:
+        parser.error("--ocr-workers and --llm-concurrency must be at least 1")
+    if args.resume and args.output is None:
+        parser.error("--resume needs --output")
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    summary = run(args)
+    print(
+        f"\n{summary['command']}: {summary['processed']} documents in {summary['elapsed_s']:.1f}s "
+        f"({summary['docs_per_s']:.2f} docs/s), {summary['errors']} errors, {summary['skipped']} skipped",
+        file=sys.stderr
+    )
+    print("Stage busy time: " + ", ".join(f"{name} {seconds:.1f}s"
+                                          for name, seconds in summary["stage_busy_s"].items()), file=sys.stderr)
+    if summary["routing"]["total"]:
+        print(f"Routing: {summary['routing']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -67,4 +67,104 @@ API_CONFIG = {
     "model": "gpt-4o-mini",
     "temperature": 0.2,
     "max_tokens": 1000
-}
\ No newline at end of file
+}
+
+# Keyword fast path: regex indicators per category, matched case-insensitively
+# against OCR text. Taken from the indicator lists in the prompt above; acronyms
+# are wrapped in (?-i:...) so they only match in capitals.
+KEYWORD_PATTERNS = {
+    "Bank Statement": [
+        r"\bstatement of account\b",
+        r"\baccount statement\b",
+        r"\bopening balance\b",
+        r"\bclosing balance\b",
+        r"\btransaction (?:date|details)\b",
+        # Column header pairs; "debit" or "deposits" alone occur in any financial text
+        r"\b(?:withdrawals?|debits?)\s+(?:amount\s+)?(?:deposits?|credits?)\b",
+        r"\bstatement period\b",
+    ],
+    "Check": [
+        r"\bpay to the order of\b",
+        r"\bpay\s+(?:to\s+)?(?:the\s+)?bearer\b",
+        r"\baccount payee only\b",
+        r"\bor bearer\b",
+        r"\bdollars\b",
+        r"\bauthori[sz]ed signatory\b",
+    ],
+    "ITR_Form 16": [
+        r"\bassessment year\b",
+        r"\bform\s*(?:no\.?\s*)?16\b",
+        r"\backnowledgement number\b",
+        r"\bincome tax return\b",
+        r"\btotal income\b",
+        r"\btax payable\b",
+        r"\b(?-i:TAN)\b",
+        r"\bsection\s*(?:80c|192|203)\b",
+    ],
+    "Salary Slip": [
+        r"\bpay\s*slip\b",
+        r"\bsalary slip\b",
+        r"\bnet pay\b",
+        r"\bgross (?:salary|pay|earnings)\b",
+        r"\bbasic (?:pay|salary)\b",
+        r"\bemployee (?:id|code|name)\b",
+        r"\btotal deductions\b",
+        r"\bprovident fund\b",
+    ],
+    "Utility": [
+        r"\bunits consumed\b",
+        r"\bbilling period\b",
+        r"\bconsumer (?:id|no\.?|number)\b",
+        r"\bbill (?:number|no\.?|date)\b",
+        r"\bamount due\b",
+        r"\bmeter (?:reading|no\.?|number)\b",
+        r"\b(?:electricity|water|gas) bill\b",
+        r"\bkwh\b",
+    ],
+}
+
+# Keyword fast path thresholds: minimum distinct indicators for the winning
+# category and minimum lead over the runner-up before skipping the LLM
+KEYWORD_CONFIG = {
+    "min_matches": 3,
+    "min_margin": 2
+}
+
+
+# Pre-OCR text height normalization: target median glyph height in pixels per
+# document type. Images whose text is taller than the target are downsampled
+# before detection; smaller text is left untouched.
+TEXT_HEIGHT_PROFILES = {
+    "default": {"target_text_height": 20, "min_scale": 0.25},
+    "Bank Statement": {"target_text_height": 18, "min_scale": 0.25},
+    "Check": {"target_text_height": 24, "min_scale": 0.35},
+    "ITR_Form 16": {"target_text_height": 18, "min_scale": 0.25},
+    "Salary Slip": {"target_text_height": 20, "min_scale": 0.25},
+    "Utility": {"target_text_height": 20, "min_scale": 0.25},
+}
+
+
+# Pre-OCR image quality gate. Metrics are measured at source resolution (large
+# scans are analyzed on a downscaled copy, small ones are never upscaled); each
+# is mapped to 0..1 against its reference value and the quality score is their
+# weighted mean. Calibrated with `python benchmark.py quality`: at min_score 0.85
+# the gate rejects 13 of the 14 scans listed under README Limitations (all but
+# the crisp Utility/91), but also 77 of the 412 readable ones, half of them
+# small check images such as Check/23. Image statistics alone cannot separate
+# those, so the gate stays opt-in.
+QUALITY_CONFIG = {
+    "min_score": 0.85,
+    "sharpness_reference": 300.0,   # Laplacian variance of a crisp scan
+    "contrast_reference": 30.0,     # Grayscale standard deviation
+    "text_height_reference": 8.0,   # Median glyph height in source pixels
+    "glyph_reference": 400,         # Character-sized components on the page
+    "weights": {"sharpness": 0.45, "contrast": 0.1, "text_height": 0.2, "glyphs": 0.25}
+}
+
+
+# OCR engine selection. "easyocr" (default) or "tesseract"; engine_options are
+# passed to the engine constructor, e.g. {"tesseract": {"config": "--psm 6"}}
+OCR_CONFIG = {
+    "engine": "easyocr",
+    "engine_options": {}
+}
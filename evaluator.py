@@ -1,12 +1,44 @@
+import asyncio
+import json
 import logging
+import multiprocessing
+import os
 import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Callable, List, Optional, Tuple, Dict
 from sklearn.metrics import accuracy_score
+from journal import end_with_newline, load_completed
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-process classifier used by evaluate(mode="process")
+_worker_classifier = None
+
+
+def _initialize_eval_worker(classifier_factory: Callable):
+    """Build one classifier per evaluation worker process."""
+    global _worker_classifier
+    _worker_classifier = classifier_factory()
+
+
+def _classify_in_worker(image_path: str) -> Tuple[Optional[Dict], Optional[str], Dict]:
+    """Classify one image inside an evaluation worker process."""
+    return _classify_one(_worker_classifier, image_path)
+
+
+def _classify_one(classifier, image_path: str) -> Tuple[Optional[Dict], Optional[str], Dict]:
+    """Run the classifier on one image, returning (prediction, error message, timings)."""
+    started = time.perf_counter()
+    try:
+        prediction, error = classifier.classify_image(image_path), None
+    except Exception as e:
+        prediction, error = None, str(e)
+    return prediction, error, {"classify_ms": (time.perf_counter() - started) * 1000}
+
 
 class AccuracyMetric:
     """
@@ -28,6 +60,7 @@ class AccuracyMetric:
         self.random_seed = random_seed
         random.seed(random_seed)
         self.categories = ["Bank Statement", "Check", "ITR_Form 16", "Salary Slip", "Utility"]
+        self.train_set = []
         logger.info(f"AccuracyMetric initialized with random_seed={random_seed}")
     
     def prepare_test_dataset(self, base_path: str, test_percentage: float = 0.2) -> List[Tuple[str, str]]:
@@ -40,6 +73,7 @@ class AccuracyMetric:
         
         Returns:
             test_set: List of (image_path, true_label) tuples for test set
+                      (the matching train split is kept on self.train_set)
         
         """
         base_path = Path(base_path)
@@ -78,6 +112,7 @@ class AccuracyMetric:
         
         train_set = all_images[:split_index]
         test_set = all_images[split_index:]
+        self.train_set = train_set
         
         logger.info(f"Train set size: {len(train_set)} ({100*(1-test_percentage):.0f}%)")
         logger.info(f"Test set size: {len(test_set)} ({100*test_percentage:.0f}%)")
@@ -93,13 +128,27 @@ class AccuracyMetric:
         
         return test_set
     
-    def evaluate(self, classifier, test_set: List[Tuple[str, str]]) -> Dict:
+    def evaluate(
+        self,
+        classifier,
+        test_set: List[Tuple[str, str]],
+        workers: int = 1,
+        mode: str = "thread",
+        classifier_factory: Callable = None,
+        journal_path: str = None
+    ) -> Dict:
         """
         Run classifier on test set and calculate accuracy.
         
         Args:
             classifier: DocumentClassifier instance with classify_image() method
             test_set: List of (image_path, true_label) tuples
+            workers: Number of images classified concurrently (default: 1 = serial)
+            mode: "thread", "process" or "async" (default: "thread")
+            classifier_factory: Picklable callable building a classifier in each
+                                worker process; required for mode="process"
+            journal_path: Optional JSONL journal; finished items are appended as
+                          they complete and skipped when the same journal is reused
         
         Returns:
             results: Dictionary with:
@@ -111,35 +160,42 @@ class AccuracyMetric:
                 - y_pred: List of predicted labels
         
         """
-        logger.info(f"Starting evaluation on {len(test_set)} test images...")
+        if mode not in ("thread", "process", "async"):
+            raise ValueError(f"Unknown evaluation mode: {mode}")
+        if mode == "process" and classifier_factory is None:
+            # The classifier's own settings (cache, engine, tiers) cannot be rebuilt from its type alone
+            raise ValueError('mode="process" needs a classifier_factory that builds the worker classifiers')
+        
+        logger.info(f"Starting evaluation on {len(test_set)} test images "
+                    f"(workers={workers}, mode={mode})...")
+        
+        journal = EvaluationJournal(journal_path) if journal_path else None
+        outcomes = self._run_predictions(classifier, test_set, workers, mode, classifier_factory, journal)
         
         y_true = []
         y_pred = []
         errors = []
+        routes = {}
+        ocr_paths = {}
         
-        for idx, (image_path, true_label) in enumerate(test_set, 1):
-            try:
-                # Run classifier
-                prediction = classifier.classify_image(image_path)
+        # Outcomes are aligned with test_set, so labels stay in input order
+        for (image_path, true_label), (prediction, error) in zip(test_set, outcomes):
+            y_true.append(true_label)
+            if error is None:
                 print("Prediction Output",prediction)
-                predicted_label = prediction.get("document_type", "unknown")
-                
-                y_true.append(true_label)
-                y_pred.append(predicted_label)
-                
-                # Log progress every 10 images
-                if idx % 10 == 0:
-                    logger.info(f"Processed {idx}/{len(test_set)} images")
-                
-            except Exception as e:
+                y_pred.append(prediction.get("document_type", "unknown"))
+                route = prediction.get("classified_by", "llm")
+                routes[route] = routes.get(route, 0) + 1
+                if "ocr_path" in prediction:
+                    ocr_paths[prediction["ocr_path"]] = ocr_paths.get(prediction["ocr_path"], 0) + 1
+            else:
                 # Error handling: Count as incorrect prediction
-                logger.warning(f"Error processing {image_path}: {str(e)}")
-                y_true.append(true_label)
+                logger.warning(f"Error processing {image_path}: {error}")
                 y_pred.append("unknown")  # Treat error as "unknown" prediction
                 errors.append({
                     "image_path": image_path,
                     "true_label": true_label,
-                    "error": str(e)
+                    "error": error
                 })
         
         # Calculate accuracy using scikit-learn
@@ -156,7 +212,9 @@ class AccuracyMetric:
             "incorrect_predictions": incorrect_predictions,
             "y_true": y_true,
             "y_pred": y_pred,
-            "errors": errors
+            "errors": errors,
+            "routes": routes,
+            "ocr_paths": ocr_paths
         }
         
         # Log results
@@ -167,6 +225,15 @@ class AccuracyMetric:
         logger.info(f"Correct Predictions: {correct_predictions}/{total_predictions}")
         logger.info(f"Incorrect Predictions: {incorrect_predictions}")
         
+        skipped_llm = sum(count for route, count in routes.items() if route != "llm")
+        if skipped_llm:
+            logger.info(f"Classified without LLM: {skipped_llm}/{total_predictions} ({routes})")
+        if ocr_paths:
+            logger.info(f"Progressive OCR paths: {ocr_paths}")
+        if routes.get("quality_gate"):
+            logger.info(f"Quality gate rejected {routes['quality_gate']} images, "
+                        f"saving {routes['quality_gate']} OCR runs and LLM calls")
+        
         if errors:
             logger.warning(f"Errors encountered: {len(errors)}")
             for error in errors[:5]:  # Show first 5 errors
@@ -175,3 +242,140 @@ class AccuracyMetric:
         logger.info("=" * 60)
         
         return results
+    
+    def _run_predictions(
+        self,
+        classifier,
+        test_set: List[Tuple[str, str]],
+        workers: int,
+        mode: str,
+        classifier_factory: Callable = None,
+        journal: "EvaluationJournal" = None
+    ) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """
+        Classify every test image, returning (prediction, error) in test_set order.
+        Items already completed in the journal are reused instead of re-run, and
+        every new outcome is journaled as soon as it finishes.
+        """
+        outcomes: List[Optional[Tuple[Optional[Dict], Optional[str]]]] = [None] * len(test_set)
+        pending = []
+        completed = journal.load() if journal is not None else {}
+        
+        for idx, (image_path, _) in enumerate(test_set):
+            if image_path in completed:
+                outcomes[idx] = (completed[image_path], None)
+            else:
+                pending.append(idx)
+        
+        if completed:
+            logger.info(f"Resuming from journal: {len(test_set) - len(pending)} done, {len(pending)} pending")
+        
+        done = 0
+        
+        def record(idx: int, outcome: Tuple[Optional[Dict], Optional[str], Dict]):
+            nonlocal done
+            prediction, error, timings = outcome
+            outcomes[idx] = (prediction, error)
+            if journal is not None:
+                image_path, true_label = test_set[idx]
+                journal.append(image_path, true_label, prediction, error, timings)
+            done += 1
+            self._log_progress(done, len(pending))
+        
+        image_paths = [test_set[idx][0] for idx in pending]
+        
+        if mode == "async":
+            asyncio.run(self._run_async(classifier, pending, image_paths, workers, record))
+            return outcomes
+        
+        if workers <= 1:
+            for idx, image_path in zip(pending, image_paths):
+                record(idx, _classify_one(classifier, image_path))
+            return outcomes
+        
+        if mode == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_eval_worker,
+                initargs=(classifier_factory,)
+            )
+            task = _classify_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eval")
+            task = lambda image_path: _classify_one(classifier, image_path)
+        
+        # Record in completion order so the journal keeps everything that finished
+        with executor:
+            futures = {executor.submit(task, image_path): idx for idx, image_path in zip(pending, image_paths)}
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+        return outcomes
+    
+    async def _run_async(
+        self,
+        classifier,
+        pending: List[int],
+        image_paths: List[str],
+        workers: int,
+        record: Callable
+    ):
+        """Classify images with the classifier's async API, bounded by workers."""
+        semaphore = asyncio.Semaphore(max(workers, 1))
+        
+        async def classify(idx: int, image_path: str):
+            started = time.perf_counter()
+            try:
+                prediction, error = await classifier.aclassify_image(image_path, semaphore=semaphore), None
+            except Exception as e:
+                prediction, error = None, str(e)
+            record(idx, (prediction, error, {"classify_ms": (time.perf_counter() - started) * 1000}))
+        
+        await asyncio.gather(*(classify(idx, path) for idx, path in zip(pending, image_paths)))
+    
+    @staticmethod
+    def _log_progress(done: int, total: int):
+        """Log progress every 10 images."""
+        if done % 10 == 0:
+            logger.info(f"Processed {done}/{total} images")
+
+
+class EvaluationJournal:
+    """
+    Append-only JSONL record of evaluation outcomes.
+    Each line holds image_path, true_label, prediction, error and timings.
+    Successful entries are skipped when an evaluation is resumed; entries
+    that ended in an error are retried.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSONL file to append to (created if missing)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._tail_checked = False
+    
+    def load(self) -> Dict[str, Dict]:
+        """Return {image_path: prediction} for successfully completed entries."""
+        return load_completed(self.path, "prediction")
+    
+    def append(self, image_path: str, true_label: str, prediction: Optional[Dict], error: Optional[str], timings: Dict):
+        """Append one outcome and flush it to disk."""
+        entry = {
+            "image_path": image_path,
+            "true_label": true_label,
+            "prediction": prediction,
+            "error": error,
+            "timings": timings
+        }
+        with self._lock:
+            if not self._tail_checked:
+                # A run killed mid-write can leave a truncated last line
+                end_with_newline(self.path)
+                self._tail_checked = True
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
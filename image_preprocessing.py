@@ -0,0 +1,205 @@
+"""
+Image preprocessing helpers applied before OCR.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from config import QUALITY_CONFIG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Text height is estimated on a copy no larger than this, then scaled back
+ANALYSIS_MAX_SIDE = 1200
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """Return a single-channel view of a BGR or grayscale image."""
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _binarize(gray: np.ndarray) -> np.ndarray:
+    """Otsu binarization with text as foreground (dark text on light background)."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    return binary
+
+
+def _glyph_heights(binary: np.ndarray) -> np.ndarray:
+    """Heights of the character-sized connected components in a binarized image."""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+    # Skip the background label and keep components shaped like characters
+    heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:count, cv2.CC_STAT_WIDTH]
+    areas = stats[1:count, cv2.CC_STAT_AREA]
+    max_height = binary.shape[0] * 0.1
+    glyphs = (heights >= 3) & (heights <= max_height) & (widths <= heights * 3) & (areas >= 6)
+    return heights[glyphs]
+
+
+def _analysis_copy(gray: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Downscale a grayscale image to at most ANALYSIS_MAX_SIDE; returns (copy, scale)."""
+    height, width = gray.shape[:2]
+    scale = min(1.0, ANALYSIS_MAX_SIDE / max(height, width))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    return gray, scale
+
+
+def estimate_text_height(image: np.ndarray, min_components: int = 20) -> Optional[float]:
+    """
+    Estimate the median glyph height of an image in pixels.
+
+    Steps :
+        1. Downscale a grayscale copy for analysis
+        2. Binarize with Otsu (dark text on light background)
+        3. Take the median height of glyph-sized connected components
+
+    Returns:
+        Median glyph height at full resolution, or None if too few glyphs were found
+    """
+    gray, scale = _analysis_copy(_to_gray(image))
+    heights = _glyph_heights(_binarize(gray))
+    if len(heights) < min_components:
+        return None
+    return float(np.median(heights)) / scale
+
+
+def resize_to_text_height(
+    image: np.ndarray,
+    target_text_height: float,
+    min_scale: float = 0.25
+) -> np.ndarray:
+    """
+    Downsample an image so its median glyph height is close to target_text_height.
+    Images are never upscaled, and never shrunk below min_scale.
+    """
+    text_height = estimate_text_height(image)
+    if text_height is None or text_height <= target_text_height:
+        return image
+
+    scale = max(min_scale, target_text_height / text_height)
+    height, width = image.shape[:2]
+    resized = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                         interpolation=cv2.INTER_AREA)
+    logger.info(f"Resized {width}x{height} -> {resized.shape[1]}x{resized.shape[0]} "
+                f"(text height {text_height:.1f}px -> ~{text_height * scale:.1f}px)")
+    return resized
+
+
+def assess_image_quality(image: np.ndarray, settings: Dict = None, source_scale: float = 1.0) -> Dict:
+    """
+    Cheap readability score for a document image.
+
+    Steps :
+        1. Downscale a grayscale copy for analysis (small scans are not upscaled,
+           so their lack of detail shows in the metrics)
+        2. Sharpness: variance of the Laplacian
+        3. Contrast: grayscale standard deviation
+        4. Text height and glyph count: character-sized components after Otsu
+
+    Args:
+        image: BGR or grayscale image
+        settings: Gate settings (default: config.QUALITY_CONFIG)
+        source_scale: Source pixels per pixel of image, when it was decoded at
+                      reduced size, so text height is reported in source pixels
+
+    Returns:
+        Dict with the raw metrics and a combined score between 0.0 and 1.0
+    """
+    settings = settings or QUALITY_CONFIG
+    gray, scale = _analysis_copy(_to_gray(image))
+
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    contrast = float(gray.std())
+    binary = _binarize(gray)
+    density = float(np.count_nonzero(binary)) / binary.size
+    heights = _glyph_heights(binary)
+    text_height = float(np.median(heights)) * source_scale / scale if len(heights) else 0.0
+
+    scores = {
+        "sharpness": min(1.0, sharpness / settings["sharpness_reference"]),
+        "contrast": min(1.0, contrast / settings["contrast_reference"]),
+        "text_height": min(1.0, text_height / settings["text_height_reference"]),
+        "glyphs": min(1.0, len(heights) / settings["glyph_reference"])
+    }
+    weights = settings["weights"]
+    score = sum(scores[name] * weights[name] for name in scores) / sum(weights.values())
+
+    return {
+        "score": score,
+        "sharpness": sharpness,
+        "contrast": contrast,
+        "text_density": density,
+        "text_height": text_height,
+        "glyphs": int(len(heights))
+    }
+
+
+# JPEG start-of-frame markers that carry the image dimensions
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# (reduction factor, OpenCV flag) from most to least reduced
+_REDUCED_GRAYSCALE_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+]
+
+
+def read_jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG header without decoding the image.
+
+    Returns:
+        (width, height), or None if data is not a JPEG or has no frame header
+    """
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        # Fill bytes and standalone markers carry no length field
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0x01,) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+
+        segment_length = int.from_bytes(data[offset + 2:offset + 4], "big")
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height = int.from_bytes(data[offset + 5:offset + 7], "big")
+            width = int.from_bytes(data[offset + 7:offset + 9], "big")
+            return width, height
+        offset += 2 + segment_length
+    return None
+
+
+def reduced_grayscale_flag(data: bytes, max_side: int) -> int:
+    """
+    Pick the cv2.imdecode flag for a grayscale decode at reduced size.
+
+    Chooses the largest libjpeg reduction (1/2, 1/4, 1/8) that keeps the
+    longer side at or above max_side, so the decoder never produces more
+    pixels than OCR will use. Non-JPEG input decodes as full-size grayscale.
+    """
+    size = read_jpeg_size(data)
+    if size is None:
+        return cv2.IMREAD_GRAYSCALE
+
+    longest = max(size)
+    for factor, flag in _REDUCED_GRAYSCALE_FLAGS:
+        if longest / factor >= max_side:
+            return flag
+    return cv2.IMREAD_GRAYSCALE
@@ -0,0 +1,65 @@
+"""
+Resume support for append-only JSONL result files.
+Shared by EvaluationJournal and the batch CLI's --resume.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_completed(path: Path, result_key: str) -> Dict[str, object]:
+    """
+    Read the successfully finished entries of a JSONL results file.
+
+    Each line is an object with image_path, error and result_key. A later
+    line for the same image replaces an earlier one, so an image whose last
+    attempt failed is left out and retried on resume. Malformed lines (a run
+    killed mid-write) are skipped.
+
+    Args:
+        path: JSONL file; a missing file has no completed entries
+        result_key: Field holding an entry's result ("prediction", "result")
+
+    Returns:
+        {image_path: result} for entries without an error
+    """
+    path = Path(path)
+    completed = {}
+    if not path.exists():
+        return completed
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed line {line_number} in {path}")
+                continue
+            if entry.get("error") is None and entry.get(result_key) is not None:
+                completed[entry["image_path"]] = entry[result_key]
+            else:
+                completed.pop(entry["image_path"], None)
+    return completed
+
+
+def end_with_newline(path: Path):
+    """
+    Terminate a truncated last line, so the next appended entry starts on a
+    line of its own instead of being glued to (and lost with) the fragment.
+    """
+    path = Path(path)
+    if not path.exists() or not path.stat().st_size:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
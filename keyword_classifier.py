@@ -0,0 +1,81 @@
+"""
+Keyword-based fast path classifier.
+Scores OCR text against indicator phrases so obvious documents can skip the LLM.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+from config import KEYWORD_PATTERNS, KEYWORD_CONFIG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class KeywordClassifier:
+    """
+    Local regex scorer over the indicator phrases for each category.
+    Returns a classification only when one category clearly wins;
+    otherwise the caller should fall back to the LLM.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]] = None, min_matches: int = None, min_margin: int = None):
+        """
+        Initialize keyword classifier.
+
+        Args:
+            patterns: {category: [regex, ...]} (default: config.KEYWORD_PATTERNS)
+            min_matches: Distinct indicators the winner needs (default: from KEYWORD_CONFIG)
+            min_margin: Required lead over the runner-up (default: from KEYWORD_CONFIG)
+        """
+        patterns = patterns or KEYWORD_PATTERNS
+        self.min_matches = min_matches if min_matches is not None else KEYWORD_CONFIG["min_matches"]
+        self.min_margin = min_margin if min_margin is not None else KEYWORD_CONFIG["min_margin"]
+        self.patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in category_patterns]
+            for category, category_patterns in patterns.items()
+        }
+
+    def score(self, text: str) -> Dict[str, List[str]]:
+        """Return the matched indicator phrases for each category."""
+        matches = {}
+        for category, category_patterns in self.patterns.items():
+            found = []
+            for pattern in category_patterns:
+                match = pattern.search(text)
+                if match:
+                    found.append(match.group(0))
+            matches[category] = found
+        return matches
+
+    def classify(self, text: str) -> Optional[Dict]:
+        """
+        Classify text if one category clearly wins.
+
+        Returns:
+            Result dict in the same shape as the LLM output, or None when ambiguous
+        """
+        if not text or not text.strip():
+            return None
+
+        matches = self.score(text)
+        ranked = sorted(matches.items(), key=lambda item: len(item[1]), reverse=True)
+        (winner, winner_matches), (_, runner_up_matches) = ranked[0], ranked[1]
+        margin = len(winner_matches) - len(runner_up_matches)
+
+        if len(winner_matches) < self.min_matches or margin < self.min_margin:
+            return None
+
+        confidence = min(0.95, 0.75 + 0.05 * margin)
+        logger.info(f"Keyword fast path matched {winner} ({len(winner_matches)} indicators, margin {margin})")
+        return {
+            "document_type": winner,
+            "confidence": confidence,
+            "reasoning": f"Matched {len(winner_matches)} {winner} indicators with a lead of {margin} "
+                         f"over the next category",
+            "key_indicators": winner_matches,
+            "negative_indicators": [
+                phrase for category, found in matches.items() if category != winner for phrase in found
+            ],
+            "classified_by": "keyword"
+        }
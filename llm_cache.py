@@ -0,0 +1,120 @@
+"""
+Persistent cache for LLM responses.
+Stores raw completion text in SQLite, keyed by the rendered prompt and model settings.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlite_cache import SQLiteCacheMixin
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache(SQLiteCacheMixin):
+    """
+    Disk-backed LLM response cache with TTL and max-size eviction.
+    Expired entries are treated as misses; once more than max_entries are
+    stored, the least recently used ones are dropped.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ".llm_cache.sqlite",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_entries: int = 10000
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file location (default: .llm_cache.sqlite)
+            ttl_seconds: Entry lifetime in seconds, None for no expiry (default: 7 days)
+            max_entries: Maximum number of cached responses (default: 10000)
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connect()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_last_access ON llm_responses(last_access)")
+        self._conn.commit()
+        logger.info(f"LLM response cache opened at {self.db_path}")
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        """Build a cache key from the rendered prompt and model settings."""
+        payload = json.dumps(
+            {"prompt": prompt, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response and evict the oldest entries if over max_entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                logger.info(f"LLM cache evicted {count - self.max_entries} entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current entry count."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries
+        }
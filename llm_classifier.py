@@ -1,7 +1,7 @@
 import os
 import logging
-from typing import Dict, Tuple
-from llama_index.llms.openai import OpenAI
+import threading
+from typing import Dict, Optional, Tuple
 from config import PYDANTIC_CLASSIFICATION_PROMPT , API_CONFIG
 from format_llm_response import parse_llm_response
 from dotenv import load_dotenv
@@ -16,30 +16,49 @@ class LLMClassifier:
     Supports both image and text input.
     """
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None, cache=None):
         """
         Initialize LLM classifier.
         
         Args:
             api_key: OpenAI API key (uses OPENAI_API_KEY env var if not provided)
             model: Model name (default: gpt-4o-mini)
+            cache: Optional LLMResponseCache for identical prompts
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
         
         self.model = model or API_CONFIG["model"]
-        self.llm = None
-        self._initialize_llm()
+        self.temperature = API_CONFIG.get("temperature", 0.2)
+        self.max_tokens = API_CONFIG.get("max_tokens", 1000)
+        self.cache = cache
+        self._llm = None
+        self._llm_lock = threading.Lock()
+    
+    @property
+    def llm(self):
+        """
+        The OpenAI client, created on first use.
+        Deferring it keeps llama_index out of import and construction time,
+        and callers served entirely from the cache never load it.
+        """
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    self._initialize_llm()
+        return self._llm
     
     def _initialize_llm(self):
         """Initialize OpenAI LLM."""
+        from llama_index.llms.openai import OpenAI
+        
         try:
-            self.llm = OpenAI(
+            self._llm = OpenAI(
                 model=self.model,
                 api_key=self.api_key,
-                temperature=API_CONFIG.get("temperature", 0.2),
-                max_tokens=API_CONFIG.get("max_tokens", 1000)
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
             )
             logger.info(f"LLM initialized with model: {self.model}")
         except Exception as e:
@@ -62,10 +81,63 @@ class LLMClassifier:
         try:            
             # Prepare prompt with text content
             prompt = PYDANTIC_CLASSIFICATION_PROMPT.format(context_str=text)
-            response = self.llm.complete(prompt)
-            formatted_response = parse_llm_response(llm_response=str(response))
+            key, response = self._cache_lookup(prompt)
+            if response is not None:
+                return parse_llm_response(llm_response=response)
+            
+            response = str(self.llm.complete(prompt))
+            formatted_response = parse_llm_response(llm_response=response)
+            # Only responses that parsed are worth replaying
+            self._cache_store(key, response)
             return formatted_response
             
         except Exception as e:
             logger.error(f"Error classifying text: {str(e)}")
             raise
+    
+    async def aclassify_text(self, text: str):
+        """
+        Async variant of classify_text using the LLM's native async completion.
+        
+        Args:
+            text: Extracted document text
+        """
+        if not text or not text.strip():
+            raise ValueError("Text content is empty")
+        
+        try:
+            prompt = PYDANTIC_CLASSIFICATION_PROMPT.format(context_str=text)
+            key, response = self._cache_lookup(prompt)
+            if response is not None:
+                return parse_llm_response(llm_response=response)
+            
+            response = str(await self.llm.acomplete(prompt))
+            formatted_response = parse_llm_response(llm_response=response)
+            self._cache_store(key, response)
+            return formatted_response
+            
+        except Exception as e:
+            logger.error(f"Error classifying text: {str(e)}")
+            raise
+    
+    def _cache_lookup(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a prompt up in the response cache.
+        
+        Returns:
+            (cache key, cached response); the key is None when caching is off
+            and the response is None on a miss
+        """
+        if self.cache is None:
+            return None, None
+        
+        key = self.cache.make_key(prompt, self.model, self.temperature, self.max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("LLM cache hit")
+        return key, cached
+    
+    def _cache_store(self, key: Optional[str], response: str):
+        """Cache a response that parsed successfully; no-op when caching is off."""
+        if key is not None:
+            self.cache.put(key, response)
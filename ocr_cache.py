@@ -0,0 +1,113 @@
+"""
+Persistent cache for OCR results.
+Stores (text, confidence) in SQLite, keyed by image content and reader settings.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlite_cache import SQLiteCacheMixin
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OCRCache(SQLiteCacheMixin):
+    """
+    Disk-backed, size-bounded LRU cache for OCR output.
+    Entries are evicted least-recently-used first once the stored text
+    exceeds max_size_bytes.
+    """
+
+    def __init__(self, db_path: str = ".ocr_cache.sqlite", max_size_bytes: int = 256 * 1024 * 1024):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file location (default: .ocr_cache.sqlite)
+            max_size_bytes: Upper bound on cached text size (default: 256 MB)
+        """
+        self.db_path = Path(db_path)
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connect()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON ocr_results(last_access)")
+        self._conn.commit()
+        logger.info(f"OCR cache opened at {self.db_path}")
+
+    @staticmethod
+    def make_key(image_bytes: bytes, languages: list, params: Dict) -> str:
+        """Build a cache key from the image bytes and reader settings."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        settings = json.dumps({"languages": list(languages), "params": params}, sort_keys=True)
+        settings_digest = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+        return f"{digest}:{settings_digest}"
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return the cached (text, confidence) for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, confidence FROM ocr_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE ocr_results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0], float(row[1])
+
+    def put(self, key: str, text: str, confidence: float):
+        """Store an OCR result and evict old entries if over budget."""
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_results (key, text, confidence, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, text, float(confidence), size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the size budget is met."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute("SELECT key, size FROM ocr_results ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM ocr_results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"OCR cache evicted {evicted} entries")
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current cache size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_results"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size_bytes": size}
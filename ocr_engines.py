@@ -0,0 +1,483 @@
+"""
+OCR engine backends.
+Each engine turns a decoded image array into an OCRResult; OCRHandler handles
+file reading, caching and preprocessing around it.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Protocol, runtime_checkable
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _empty_boxes() -> np.ndarray:
+    return np.zeros((0, 4, 2), dtype=np.float32)
+
+
+def _empty_texts() -> np.ndarray:
+    return np.array([], dtype=object)
+
+
+def _empty_confidences() -> np.ndarray:
+    return np.zeros(0, dtype=np.float32)
+
+
+@dataclass
+class OCRResult:
+    """
+    Recognized text segments for one image, stored as compact arrays.
+
+    boxes: float32 (N, 4, 2) corner points (top-left, top-right,
+           bottom-right, bottom-left) in image pixels
+    texts: object (N,) segment strings
+    confidences: float32 (N,) segment confidences
+    """
+
+    boxes: np.ndarray = field(default_factory=_empty_boxes)
+    texts: np.ndarray = field(default_factory=_empty_texts)
+    confidences: np.ndarray = field(default_factory=_empty_confidences)
+
+    @classmethod
+    def from_segments(cls, boxes: list, texts: List[str], confidences: List[float]) -> "OCRResult":
+        """Build a result from per-segment lists, converting to arrays once."""
+        if not texts:
+            return cls()
+        text_array = np.empty(len(texts), dtype=object)
+        text_array[:] = texts
+        return cls(
+            boxes=np.asarray(boxes, dtype=np.float32).reshape(-1, 4, 2),
+            texts=text_array,
+            confidences=np.asarray(confidences, dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def text(self) -> str:
+        """All segments joined with newlines, in engine order."""
+        return "\n".join(self.texts)
+
+    @property
+    def confidence(self) -> float:
+        """Mean segment confidence (0.0 when nothing was recognized)."""
+        if not len(self.confidences):
+            return 0.0
+        return float(self.confidences.mean(dtype=np.float64))
+
+    def as_tuple(self):
+        """The (text, confidence) pair returned by OCRHandler.extract_text_from_image."""
+        return self.text, self.confidence
+
+    def subset(self, indices) -> "OCRResult":
+        """A new result holding only the given segment indices, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return OCRResult(boxes=self.boxes[indices], texts=self.texts[indices], confidences=self.confidences[indices])
+
+    def rescaled(self, scale_x: float, scale_y: float) -> "OCRResult":
+        """A copy with box coordinates multiplied by (scale_x, scale_y)."""
+        if scale_x == 1.0 and scale_y == 1.0:
+            return self
+        scale = np.array([scale_x, scale_y], dtype=np.float32)
+        return OCRResult(boxes=self.boxes * scale, texts=self.texts, confidences=self.confidences)
+
+    def line_groups(self, overlap: float = 0.5) -> List[np.ndarray]:
+        """
+        Group segments into text lines, top to bottom, each sorted left to right.
+        A segment joins a line when its vertical extent overlaps the line's by
+        at least overlap of the smaller height.
+        """
+        if not len(self):
+            return []
+
+        tops = self.boxes[:, :, 1].min(axis=1)
+        bottoms = self.boxes[:, :, 1].max(axis=1)
+        lefts = self.boxes[:, :, 0].min(axis=1)
+
+        lines = []
+        line_top = line_bottom = None
+        for idx in np.argsort(tops, kind="stable"):
+            if lines:
+                shared = min(bottoms[idx], line_bottom) - max(tops[idx], line_top)
+                smaller = max(min(bottoms[idx] - tops[idx], line_bottom - line_top), 1e-6)
+                if shared / smaller >= overlap:
+                    lines[-1].append(idx)
+                    line_top, line_bottom = min(line_top, tops[idx]), max(line_bottom, bottoms[idx])
+                    continue
+            lines.append([idx])
+            line_top, line_bottom = tops[idx], bottoms[idx]
+
+        return [np.array(sorted(line, key=lambda i: lefts[i]), dtype=np.intp) for line in lines]
+
+    def sorted(self, overlap: float = 0.5) -> "OCRResult":
+        """A copy with segments in reading order (lines top to bottom, left to right)."""
+        groups = self.line_groups(overlap)
+        if not groups:
+            return OCRResult()
+        return self.subset(np.concatenate(groups))
+
+    def lines(self, overlap: float = 0.5) -> List[Dict]:
+        """
+        Reading-order text lines.
+
+        Returns:
+            List of {"text", "confidence", "box"} where box is the float32
+            (4, 2) bounding rectangle of the line's segments
+        """
+        output = []
+        for indices in self.line_groups(overlap):
+            points = self.boxes[indices].reshape(-1, 2)
+            (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+            output.append({
+                "text": " ".join(self.texts[indices]),
+                "confidence": float(self.confidences[indices].mean()),
+                "box": np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float32)
+            })
+        return output
+
+
+# Process-wide reader registry: loaded models keyed by (languages, gpu, params)
+_readers: Dict[tuple, object] = {}
+_reader_locks: Dict[tuple, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def reader_key(languages: List[str], gpu: bool, params: Dict) -> tuple:
+    """Registry key for a reader; params must capture everything that changes the loaded model."""
+    return tuple(languages), bool(gpu), json.dumps(params, sort_keys=True, default=str)
+
+
+def get_shared_reader(key: tuple, build: Callable[[], object]):
+    """
+    Return the reader registered under key, building it on first use.
+
+    Construction holds a per-key lock, so concurrent callers asking for the
+    same reader wait for a single load while readers for other keys can load
+    in parallel.
+    """
+    with _registry_lock:
+        reader = _readers.get(key)
+        if reader is not None:
+            return reader
+        lock = _reader_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        with _registry_lock:
+            reader = _readers.get(key)
+        if reader is None:
+            reader = build()
+            with _registry_lock:
+                _readers[key] = reader
+            logger.info(f"Loaded shared OCR reader for languages={list(key[0])}, gpu={key[1]}")
+        else:
+            logger.info(f"Reusing shared OCR reader for languages={list(key[0])}, gpu={key[1]}")
+    return reader
+
+
+def registered_readers() -> List[tuple]:
+    """Keys of the readers loaded in this process."""
+    with _registry_lock:
+        return list(_readers)
+
+
+def clear_readers():
+    """
+    Drop every registered reader. Engines that already hold a reader keep it;
+    the memory is freed once they are gone too.
+    """
+    with _registry_lock:
+        _readers.clear()
+        _reader_locks.clear()
+
+
+@runtime_checkable
+class OCREngine(Protocol):
+    """Interface every OCR backend implements."""
+
+    name: str
+
+    def extract(self, image: np.ndarray) -> OCRResult:
+        """Recognize text in a decoded BGR or grayscale image."""
+        ...
+
+    def extract_batch(self, images: List[np.ndarray], batch_size: int = 8) -> List[OCRResult]:
+        """Recognize text in several images, preserving order."""
+        ...
+
+
+class EasyOCREngine:
+    """
+    EasyOCR backend (CRAFT detector + CRNN recognizer).
+    Engines with the same languages, device and reader settings share one
+    reader from the process-wide registry instead of loading the models again.
+    """
+
+    name = "easyocr"
+
+    def __init__(
+        self,
+        languages: list = None,
+        gpu: bool = False,
+        reader_options: Dict = None,
+        quantize: Optional[bool] = None
+    ):
+        """
+        Args:
+            languages: List of EasyOCR language codes (default: ['en'])
+            gpu: Whether to use GPU (default: False)
+            reader_options: Extra easyocr.Reader keyword arguments
+            quantize: True applies dynamic int8 quantization to the recognizer's
+                      LSTM and Linear layers after load; False keeps fp32 weights;
+                      None leaves EasyOCR's own default (default: None)
+        """
+        if quantize and gpu:
+            raise ValueError("Dynamic int8 quantization is CPU-only; use quantize=False with gpu=True")
+
+        self.languages = languages or ['en']
+        self.gpu = gpu
+        self.quantize = quantize
+        self.reader_options = dict(reader_options or {})
+        if quantize is not None:
+            # Load fp32 weights; quantization, if requested, is applied explicitly below
+            self.reader_options["quantize"] = False
+        self.reader = get_shared_reader(
+            reader_key(self.languages, self.gpu, self._reader_params()),
+            self._build_reader
+        )
+        logger.info(f"EasyOCR engine initialized with languages: {self.languages}")
+
+    def _reader_params(self) -> Dict:
+        """Settings that distinguish this engine's reader in the registry."""
+        return {"engine": self.name, "reader_options": self.reader_options, "quantize": self.quantize}
+
+    def _build_reader(self):
+        """Load the EasyOCR models; called once per registry key."""
+        import easyocr
+
+        reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False, **self.reader_options)
+        if self.quantize:
+            self._quantize_recognizer(reader)
+        return reader
+
+    @staticmethod
+    def _quantize_recognizer(reader):
+        """Replace the reader's recognizer with a dynamically int8-quantized copy."""
+        import torch
+
+        reader.recognizer = torch.quantization.quantize_dynamic(
+            reader.recognizer,
+            {torch.nn.LSTM, torch.nn.Linear},
+            dtype=torch.qint8
+        )
+        logger.info("Recognizer LSTM/Linear layers quantized to int8")
+
+    @staticmethod
+    def _to_result(results: list) -> OCRResult:
+        return OCRResult.from_segments(
+            boxes=[item[0] for item in results],
+            texts=[item[1] for item in results],
+            confidences=[float(item[2]) for item in results]
+        )
+
+    def extract(self, image: np.ndarray) -> OCRResult:
+        return self._to_result(self.reader.readtext(image, detail=1))
+
+    def extract_batch(
+        self,
+        images: List[np.ndarray],
+        batch_size: int = 8,
+        max_padding: float = 0.25
+    ) -> List[OCRResult]:
+        """
+        Run images through readtext_batched.
+
+        readtext_batched stacks its inputs into one detector batch, so every
+        image in a call must have the same shape. Scans rarely share an exact
+        size, so images are grouped into size buckets (see size_buckets) and
+        padded on the bottom/right with white up to the bucket's canvas.
+        Padding never moves existing pixels, so the returned boxes are in each
+        image's own coordinates. A bucket holding a single image falls back to
+        readtext.
+
+        Args:
+            images: Decoded BGR or grayscale arrays
+            batch_size: Maximum number of images per bucket
+            max_padding: Largest fraction of extra (padded) pixels a bucket may
+                         add over its images' own area (default: 0.25)
+        """
+        outputs: List[OCRResult] = [OCRResult() for _ in images]
+        buckets = size_buckets([image.shape for image in images], batch_size, max_padding)
+
+        for bucket in buckets:
+            if len(bucket) == 1:
+                batch_results = [self.reader.readtext(images[bucket[0]], detail=1)]
+            else:
+                height = max(images[idx].shape[0] for idx in bucket)
+                width = max(images[idx].shape[1] for idx in bucket)
+                batch_results = self.reader.readtext_batched(
+                    [pad_to_canvas(images[idx], height, width) for idx in bucket],
+                    detail=1,
+                    batch_size=batch_size
+                )
+            for idx, results in zip(bucket, batch_results):
+                outputs[idx] = self._to_result(results)
+
+        batched = sum(len(bucket) for bucket in buckets if len(bucket) > 1)
+        logger.info(f"EasyOCR batch: {len(images)} images in {len(buckets)} size buckets "
+                    f"({batched} batched)")
+        return outputs
+
+
+def size_buckets(shapes: List[tuple], batch_size: int = 8, max_padding: float = 0.25) -> List[List[int]]:
+    """
+    Group image shapes into buckets that can share one padded canvas.
+
+    Shapes are sorted by channel count, orientation and size, then filled
+    greedily: an image joins the current bucket while the bucket stays within
+    batch_size images and its canvas (max height x max width, times the
+    number of images) is at most (1 + max_padding) of the images' own area.
+
+    Returns:
+        Lists of indices into shapes; every index appears exactly once
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    def channels(shape: tuple) -> int:
+        return shape[2] if len(shape) > 2 else 1
+
+    order = sorted(
+        range(len(shapes)),
+        key=lambda idx: (channels(shapes[idx]), shapes[idx][0] >= shapes[idx][1], shapes[idx][0], shapes[idx][1])
+    )
+
+    buckets: List[List[int]] = []
+    bucket: List[int] = []
+    height = width = area = 0
+    for idx in order:
+        shape = shapes[idx]
+        if bucket:
+            grown_height, grown_width = max(height, shape[0]), max(width, shape[1])
+            grown_area = area + shape[0] * shape[1]
+            fits = (
+                len(bucket) < batch_size
+                and channels(shape) == channels(shapes[bucket[0]])
+                and grown_height * grown_width * (len(bucket) + 1) <= (1 + max_padding) * grown_area
+            )
+            if fits:
+                bucket.append(idx)
+                height, width, area = grown_height, grown_width, grown_area
+                continue
+            buckets.append(bucket)
+        bucket = [idx]
+        height, width, area = shape[0], shape[1], shape[0] * shape[1]
+    if bucket:
+        buckets.append(bucket)
+    return buckets
+
+
+def pad_to_canvas(image: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Pad image on the bottom and right with white up to height x width."""
+    if image.shape[:2] == (height, width):
+        return image
+    canvas = np.full((height, width) + image.shape[2:], 255, dtype=image.dtype)
+    canvas[:image.shape[0], :image.shape[1]] = image
+    return canvas
+
+
+class TesseractEngine:
+    """Tesseract backend via pytesseract (requires the tesseract binary)."""
+
+    name = "tesseract"
+
+    # EasyOCR language codes -> Tesseract traineddata names
+    LANGUAGE_MAP = {"en": "eng", "hi": "hin", "te": "tel", "ta": "tam"}
+
+    def __init__(self, languages: list = None, config: str = "--oem 1 --psm 3"):
+        """
+        Args:
+            languages: List of EasyOCR-style language codes (default: ['en'])
+            config: Extra tesseract CLI flags (default: LSTM engine, automatic layout)
+        """
+        try:
+            import pytesseract
+        except ImportError as e:
+            raise ImportError(
+                "The tesseract OCR engine needs pytesseract and the tesseract binary. "
+                "Install with: pip install pytesseract"
+            ) from e
+
+        self._pytesseract = pytesseract
+        self.languages = languages or ['en']
+        self.lang = "+".join(self.LANGUAGE_MAP.get(code, code) for code in self.languages)
+        self.config = config
+        logger.info(f"Tesseract engine initialized with languages: {self.lang}")
+
+    def extract(self, image: np.ndarray) -> OCRResult:
+        """Recognize words and group them into lines, like EasyOCR's segments."""
+        # pytesseract reads 3-channel arrays as RGB; the pipeline decodes BGR
+        # (or BGRA). Grayscale arrays pass through unchanged.
+        if image.ndim == 3:
+            image = np.ascontiguousarray(image[..., 2::-1]) if image.shape[2] >= 3 else image[..., 0]
+        data = self._pytesseract.image_to_data(
+            image,
+            lang=self.lang,
+            config=self.config,
+            output_type=self._pytesseract.Output.DICT
+        )
+
+        lines: Dict[tuple, List[int]] = {}
+        for idx, word in enumerate(data["text"]):
+            # Tesseract reports -1 confidence for non-word layout boxes
+            if not word.strip() or float(data["conf"][idx]) < 0:
+                continue
+            key = (data["block_num"][idx], data["par_num"][idx], data["line_num"][idx])
+            lines.setdefault(key, []).append(idx)
+
+        boxes, texts, confidences = [], [], []
+        for indices in lines.values():
+            x0 = min(data["left"][idx] for idx in indices)
+            y0 = min(data["top"][idx] for idx in indices)
+            x1 = max(data["left"][idx] + data["width"][idx] for idx in indices)
+            y1 = max(data["top"][idx] + data["height"][idx] for idx in indices)
+            boxes.append([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])
+            texts.append(" ".join(data["text"][idx] for idx in indices))
+            confidences.append(float(np.mean([float(data["conf"][idx]) for idx in indices])) / 100.0)
+        return OCRResult.from_segments(boxes, texts, confidences)
+
+    def extract_batch(self, images: List[np.ndarray], batch_size: int = 8) -> List[OCRResult]:
+        return [self.extract(image) for image in images]
+
+
+ENGINES = {
+    EasyOCREngine.name: EasyOCREngine,
+    TesseractEngine.name: TesseractEngine,
+}
+
+
+def create_engine(name: str, languages: list = None, gpu: bool = False, **kwargs) -> OCREngine:
+    """
+    Build an OCR engine by name.
+
+    Args:
+        name: One of ENGINES ("easyocr", "tesseract") or "onnx"
+        languages: List of language codes (default: ['en'])
+        gpu: Whether to use GPU, for engines that support it
+        **kwargs: Engine-specific options
+    """
+    if name == "onnx" and name not in ENGINES:
+        # Registered lazily so onnxruntime is only imported when requested
+        from onnx_engine import OnnxEasyOCREngine
+        ENGINES[OnnxEasyOCREngine.name] = OnnxEasyOCREngine
+
+    if name not in ENGINES:
+        raise ValueError(f"Unknown OCR engine: {name}. Available: {sorted(set(ENGINES) | {'onnx'})}")
+    if name == TesseractEngine.name:
+        return TesseractEngine(languages=languages, **kwargs)
+    return ENGINES[name](languages=languages, gpu=gpu, **kwargs)
@@ -1,85 +1,386 @@
 """
 OCR Handler for extracting text from images.
-Uses EasyOCR for robust text extraction.
+Uses EasyOCR for robust text extraction by default; other engines are
+selectable through config.OCR_CONFIG or the engine argument.
+OpenCV (and through it image_preprocessing) is imported on first decode, so
+importing this module stays cheap for text-only callers.
 """
 
-import easyocr
-import cv2
 import numpy as np
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Union
 import logging
+from config import OCR_CONFIG, TEXT_HEIGHT_PROFILES
+from ocr_engines import OCRResult, create_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A file path, encoded image bytes (e.g. an HTTP upload) or a decoded BGR array
+ImageSource = Union[str, Path, bytes, bytearray, memoryview, np.ndarray]
+
+
+class ImageDecodeError(ValueError):
+    """Image bytes are empty or cannot be decoded as an image."""
+
+
+def describe_source(image: ImageSource) -> str:
+    """Short label for an image source, for logs and error messages."""
+    if isinstance(image, np.ndarray):
+        return f"<array {'x'.join(str(d) for d in image.shape)}>"
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return f"<{memoryview(image).nbytes} bytes>"
+    return str(image)
+
 class OCRHandler:
     """
     Handles OCR operations for document images.
-    Extracts text from images using EasyOCR.
+    Reads, caches and preprocesses images, then extracts text with an OCR engine.
+    Handlers with the same languages, device and engine settings share one
+    loaded model through the reader registry in ocr_engines.
     """
     
-    def __init__(self, languages: list = None, gpu: bool = False):
+    def __init__(
+        self,
+        languages: list = None,
+        gpu: bool = False,
+        cache=None,
+        text_height_profile: str = None,
+        decode_mode: str = "color",
+        max_decode_side: int = 2560,
+        engine: str = None,
+        quantize: bool = None
+    ):
         """
         Initialize OCR handler.
         
         Args:
             languages: List of language codes (default: ['en'])
             gpu: Whether to use GPU (default: False)
+            cache: Optional OCRCache; hits skip both image decode and OCR
+            text_height_profile: Key into config.TEXT_HEIGHT_PROFILES (e.g. "default",
+                                 "Bank Statement"); images with taller text are
+                                 downsampled before detection (default: None = off)
+            decode_mode: "color" for full BGR decode, or "reduced_gray" to decode
+                         JPEGs straight to grayscale at 1/2, 1/4 or 1/8 size
+                         (default: "color")
+            max_decode_side: Smallest longer side a reduced decode may produce;
+                             matches EasyOCR's default canvas size (default: 2560)
+            engine: OCR engine name, see ocr_engines.ENGINES
+                    (default: config.OCR_CONFIG["engine"])
+            quantize: EasyOCR only. True applies dynamic int8 quantization to the
+                      recognizer's LSTM/Linear layers, False keeps fp32, None keeps
+                      EasyOCR's default (default: None)
         """
         self.languages = languages or ['en']
         self.gpu = gpu
+        self.cache = cache
+        if text_height_profile is not None and text_height_profile not in TEXT_HEIGHT_PROFILES:
+            raise ValueError(f"Unknown text height profile: {text_height_profile}")
+        self.text_height_profile = text_height_profile
+        if decode_mode not in ("color", "reduced_gray"):
+            raise ValueError(f"Unknown decode mode: {decode_mode}")
+        self.decode_mode = decode_mode
+        self.max_decode_side = max_decode_side
+        self.engine_name = engine or OCR_CONFIG["engine"]
+        self.quantize = quantize
+        self.engine = None
         self.reader = None
         self._initialize_reader()
     
     def _initialize_reader(self):
-        """Initialize EasyOCR reader."""
+        """Initialize the OCR engine."""
         try:
-            self.reader = easyocr.Reader(
-                self.languages,
+            options = dict(OCR_CONFIG.get("engine_options", {}).get(self.engine_name, {}))
+            if self.quantize is not None:
+                if self.engine_name != "easyocr":
+                    raise ValueError(f"quantize is only supported by the easyocr engine, not {self.engine_name}")
+                options["quantize"] = self.quantize
+            self.engine = create_engine(
+                self.engine_name,
+                languages=self.languages,
                 gpu=self.gpu,
-                verbose=False
+                **options
             )
-            logger.info(f"OCR reader initialized with languages: {self.languages}")
+            # Kept for callers that use the EasyOCR reader directly
+            self.reader = getattr(self.engine, "reader", None)
+            logger.info(f"OCR engine '{self.engine_name}' initialized with languages: {self.languages}")
         except Exception as e:
             logger.error(f"Failed to initialize OCR reader: {str(e)}")
             raise
     
-    def extract_text_from_image(self, image_path: str) -> Tuple[str, float]:
+    def extract_text_from_image(self, image_path: ImageSource) -> Tuple[str, float]:
         """
-        Extract text from an image file.
+        Extract text from an image file, encoded image bytes or a decoded array.
+        
+        Bytes and memoryviews are decoded with cv2.imdecode and cached by their
+        content, exactly like the file they came from, so uploads never need a
+        temporary file.
         
         Steps :
-            1. Read image
-            2. Extract text using EasyOCR
-            3. Calculate average confidence
+            1. Read image bytes and check the OCR cache
+            2. Decode image
+            3. Extract text using the OCR engine
+            4. Calculate average confidence
         """
-        image_path = Path(image_path)
+        if isinstance(image_path, np.ndarray):
+            return self.extract_text_from_array(image_path)
         
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+        image_bytes, image_path = self._read_source(image_path)
         
         try:
-            # Read image
-            image = cv2.imread(str(image_path))
-            if image is None:
-                raise ValueError(f"Failed to read image: {image_path}")
+            # Try the cache before decoding
+            cache_key = self._cache_key(image_bytes)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"OCR cache hit for {image_path}")
+                    return cached
             
-            # Extract text using EasyOCR
-            results = self.reader.readtext(image, detail=1)
+            image = self._prepare_image(self._decode_image(image_bytes, source=image_path))
             
-            if not results:
+            # Extract text using the OCR engine
+            result = self.engine.extract(image)
+            extracted_text, avg_confidence = result.as_tuple()
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, extracted_text, avg_confidence)
+            
+            if not result.texts:
                 logger.warning(f"No text extracted from image: {image_path}")
                 return "", 0.0
             
-            # Combine text and calculate average confidence
-            extracted_text = "\n".join([text[1] for text in results])
-            avg_confidence = np.mean([text[2] for text in results])
-            
             logger.info(f"Extracted text from {image_path} with confidence: {avg_confidence:.2f}")
-            return extracted_text, float(avg_confidence)
+            return extracted_text, avg_confidence
             
         except Exception as e:
             logger.error(f"Error extracting text from {image_path}: {str(e)}")
             raise
+    
+    def extract_result(self, image: ImageSource) -> OCRResult:
+        """
+        Extract structured OCR output from an image file, bytes or decoded array.
+        
+        Unlike extract_text_from_image, the boxes are kept (as float32 arrays)
+        so layout-aware consumers can use result.sorted() / result.lines()
+        without a second OCR pass. Boxes are mapped back from the
+        preprocessed image (text height resize, reduced decode) to the
+        source image's pixel coordinates. The OCR cache stores text only, so
+        it is not consulted here.
+        """
+        if isinstance(image, np.ndarray):
+            source_height, source_width = image.shape[:2]
+        else:
+            image_bytes, source = self._read_source(image)
+            image = self._decode_image(image_bytes, source=source)
+            source_width, source_height = self._source_size(image_bytes, image)
+        
+        prepared = self._prepare_image(image)
+        result = self.engine.extract(prepared)
+        return result.rescaled(source_width / prepared.shape[1], source_height / prepared.shape[0])
+    
+    def extract_text_from_band(
+        self,
+        image_path: Union[str, Path, bytes, bytearray, memoryview],
+        start: float,
+        stop: float
+    ) -> Tuple[str, float]:
+        """
+        Extract text from a horizontal band of an image file or encoded bytes.
+        
+        The band is given as fractions of the page height (rows
+        int(height * start) to int(height * stop)) and is cached under the
+        image bytes plus the band, so a repeated progressive read of the same
+        page skips both decode and OCR.
+        
+        Args:
+            image_path: Image file path or encoded bytes
+            start: Top of the band as a fraction of the height (0.0 = top)
+            stop: Bottom of the band as a fraction of the height (1.0 = bottom)
+        """
+        if not 0.0 <= start < stop <= 1.0:
+            raise ValueError(f"Invalid band: {start}-{stop}")
+        
+        image_bytes, image_path = self._read_source(image_path)
+        cache_key = self._cache_key(image_bytes, band=(start, stop))
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"OCR cache hit for {image_path} rows {start:.2f}-{stop:.2f}")
+                return cached
+        
+        image = self._decode_image(image_bytes, source=image_path)
+        height = image.shape[0]
+        output = self.extract_text_from_array(image[int(height * start):int(height * stop)])
+        if cache_key is not None:
+            self.cache.put(cache_key, *output)
+        return output
+    
+    def load_image(self, image_path: Union[str, Path, bytes, bytearray, memoryview]) -> np.ndarray:
+        """Read and decode an image file or encoded bytes into a BGR array."""
+        image_bytes, source = self._read_source(image_path)
+        return self._decode_image(image_bytes, source=source)
+    
+    @staticmethod
+    def assess_quality(image_path: ImageSource) -> dict:
+        """
+        Score how readable an image is before spending OCR on it.
+        Decodes a reduced-size grayscale copy, which is all the metrics need.
+        Needs no OCR engine, so it can be called on the class as well.
+        """
+        import cv2
+        from image_preprocessing import ANALYSIS_MAX_SIDE, assess_image_quality, read_jpeg_size, reduced_grayscale_flag
+        
+        if isinstance(image_path, np.ndarray):
+            return assess_image_quality(image_path)
+        
+        image_bytes, image_path = OCRHandler._read_source(image_path)
+        flag = reduced_grayscale_flag(image_bytes, max_side=ANALYSIS_MAX_SIDE)
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flag)
+        if image is None:
+            raise ImageDecodeError(f"Failed to read image: {image_path}")
+        size = read_jpeg_size(image_bytes)
+        source_scale = size[0] / image.shape[1] if size else 1.0
+        return assess_image_quality(image, source_scale=source_scale)
+    
+    def extract_text_from_array(self, image: np.ndarray) -> Tuple[str, float]:
+        """
+        Extract text from an already decoded BGR array.
+        The OCR cache is keyed by encoded bytes, so it is not consulted here.
+        """
+        return self.engine.extract(self._prepare_image(image)).as_tuple()
+    
+    def extract_text_batch(
+        self,
+        images: List[ImageSource],
+        batch_size: int = 8
+    ) -> List[Tuple[str, float]]:
+        """
+        Extract text from several images in one go.
+        
+        Cache hits are served first; the remaining images are decoded and
+        handed to the engine's extract_batch (for EasyOCR, readtext_batched
+        over padded size buckets).
+        
+        Args:
+            images: Image file paths, encoded bytes and/or already decoded BGR arrays
+            batch_size: Maximum number of images per detector/recognizer batch
+            
+        Returns:
+            List of (text, confidence) tuples, in the same order as images
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        outputs: List[Tuple[str, float]] = [("", 0.0)] * len(images)
+        decoded = {}
+        cache_keys = {}
+        
+        for idx, image in enumerate(images):
+            if isinstance(image, np.ndarray):
+                decoded[idx] = self._prepare_image(image)
+                continue
+            
+            image_bytes, image_path = self._read_source(image)
+            cache_key = self._cache_key(image_bytes)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    outputs[idx] = cached
+                    continue
+                cache_keys[idx] = cache_key
+            decoded[idx] = self._prepare_image(self._decode_image(image_bytes, source=image_path))
+        
+        indices = list(decoded)
+        results = self.engine.extract_batch([decoded[idx] for idx in indices], batch_size=batch_size)
+        for idx, result in zip(indices, results):
+            outputs[idx] = result.as_tuple()
+            if idx in cache_keys:
+                self.cache.put(cache_keys[idx], *outputs[idx])
+        
+        logger.info(f"Extracted text from {len(decoded)} images "
+                    f"({len(images) - len(decoded)} served from cache)")
+        return outputs
+    
+    @staticmethod
+    def _read_source(image) -> Tuple[bytes, str]:
+        """Return the encoded bytes and a log label for a file path or bytes-like image."""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            image_bytes = bytes(image)
+            if not image_bytes:
+                raise ImageDecodeError("Image bytes are empty")
+            return image_bytes, describe_source(image_bytes)
+        
+        image_path = Path(image)
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        return image_path.read_bytes(), str(image_path)
+    
+    def _cache_key(self, image_bytes: bytes, band: Tuple[float, float] = None) -> Optional[str]:
+        """Return the cache key for image_bytes (or one band of it), or None when caching is off."""
+        if self.cache is None:
+            return None
+        params = self._cache_params()
+        if band is not None:
+            params["band"] = list(band)
+        return self.cache.make_key(image_bytes, self.languages, params)
+    
+    def _cache_params(self) -> dict:
+        """Reader settings that affect OCR output and must be part of the cache key."""
+        return {
+            "engine": self.engine_name,
+            "quantize": self.quantize,
+            "detail": 1,
+            "gpu": self.gpu,
+            "text_height": self._text_height_settings(),
+            "decode_mode": self.decode_mode,
+            "max_decode_side": self.max_decode_side if self.decode_mode == "reduced_gray" else None
+        }
+    
+    def _text_height_settings(self) -> Optional[dict]:
+        """Resolved text height profile, or None when resizing is off."""
+        if self.text_height_profile is None:
+            return None
+        return TEXT_HEIGHT_PROFILES[self.text_height_profile]
+    
+    def _prepare_image(self, image: np.ndarray) -> np.ndarray:
+        """Apply configured preprocessing to a decoded image before OCR."""
+        settings = self._text_height_settings()
+        if settings is None:
+            return image
+        from image_preprocessing import resize_to_text_height
+        return resize_to_text_height(
+            image,
+            target_text_height=settings["target_text_height"],
+            min_scale=settings.get("min_scale", 0.25)
+        )
+    
+    def _source_size(self, image_bytes: bytes, decoded: np.ndarray) -> Tuple[int, int]:
+        """(width, height) of the encoded image, which a reduced decode shrinks."""
+        height, width = decoded.shape[:2]
+        if self.decode_mode != "reduced_gray":
+            return width, height
+        
+        from image_preprocessing import read_jpeg_size
+        size = read_jpeg_size(image_bytes)
+        if size is None:
+            return width, height
+        # The header size is before any EXIF rotation the decoder applied
+        if (size[0] > size[1]) != (width > height):
+            size = size[1], size[0]
+        return size
+    
+    def _decode_image(self, image_bytes: bytes, source=None) -> np.ndarray:
+        """Decode encoded image bytes into a BGR (or reduced grayscale) array."""
+        import cv2
+        from image_preprocessing import reduced_grayscale_flag
+        
+        if self.decode_mode == "reduced_gray":
+            flag = reduced_grayscale_flag(image_bytes, self.max_decode_side)
+        else:
+            flag = cv2.IMREAD_COLOR
+        decoded = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flag)
+        if decoded is None:
+            raise ImageDecodeError(f"Failed to read image: {source}")
+        return decoded
 
@@ -0,0 +1,317 @@
+"""
+Process pool for OCR.
+Each worker process loads its own EasyOCR reader once and serves jobs from the pool queue.
+Decoded arrays are handed to workers through a shared-memory FrameRing rather
+than pickled through the queue.
+"""
+
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import TEXT_HEIGHT_PROFILES
+from image_preprocessing import assess_image_quality, reduced_grayscale_flag
+from ocr_engines import OCRResult
+from ocr_handler import ImageDecodeError
+from shared_frames import FrameHandle, FrameRing, attach_frame
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Per-process OCR handler, created by _initialize_worker
+_worker_handler = None
+
+
+def _initialize_worker(
+    languages: list,
+    gpu: bool,
+    torch_threads: int,
+    cache_path: Optional[str],
+    engine: Optional[str],
+    quantize: Optional[bool],
+    text_height_profile: Optional[str],
+    decode_mode: str,
+    max_decode_side: int
+):
+    """Load the OCR handler once when a worker process starts."""
+    global _worker_handler
+    import torch
+    from ocr_handler import OCRHandler
+    from ocr_cache import OCRCache
+
+    torch.set_num_threads(torch_threads)
+    cache = OCRCache(db_path=cache_path) if cache_path else None
+    _worker_handler = OCRHandler(
+        languages=languages,
+        gpu=gpu,
+        cache=cache,
+        text_height_profile=text_height_profile,
+        decode_mode=decode_mode,
+        max_decode_side=max_decode_side,
+        engine=engine,
+        quantize=quantize
+    )
+    logger.info(f"OCR worker {multiprocessing.current_process().name} ready "
+                f"with {torch_threads} torch thread(s)")
+
+
+def _run_extract(image_path) -> Tuple[str, float]:
+    """Run OCR on a single image file or encoded bytes inside a worker process."""
+    return _worker_handler.extract_text_from_image(image_path=image_path)
+
+
+def _run_extract_frame(handle: FrameHandle) -> Tuple[str, float]:
+    """Run OCR on a decoded frame mapped from the parent's FrameRing."""
+    image = attach_frame(handle)
+    try:
+        return _worker_handler.extract_text_from_array(image)
+    finally:
+        # Drop the view before the parent can reuse the slot
+        del image
+
+
+def _run_extract_array(image: np.ndarray) -> Tuple[str, float]:
+    """Run OCR on a pickled array (frames too large for a ring slot)."""
+    return _worker_handler.extract_text_from_array(image)
+
+
+def _run_extract_result(image) -> OCRResult:
+    """Run OCR keeping the boxes, inside a worker process."""
+    return _worker_handler.extract_result(image)
+
+
+def _run_assess_quality(image_path) -> dict:
+    """Score image quality inside a worker process."""
+    return _worker_handler.assess_quality(image_path=image_path)
+
+
+class OCRPool:
+    """
+    Runs OCR across several worker processes, each with a warm EasyOCR reader.
+    Exposes the same extract_text_from_image() interface as OCRHandler, so it
+    can be passed to DocumentClassifier in place of the in-process handler.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        torch_threads: int = 1,
+        languages: list = None,
+        gpu: bool = False,
+        cache_path: str = None,
+        engine: str = None,
+        quantize: bool = None,
+        text_height_profile: str = None,
+        decode_mode: str = "color",
+        max_decode_side: int = 2560,
+        frame_slots: int = None,
+        frame_slot_mb: int = None,
+        frame_memory_mb: int = 48
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            torch_threads: Torch intra-op threads per worker (default: 1)
+            languages: List of language codes (default: ['en'])
+            gpu: Whether workers use GPU (default: False)
+            cache_path: Optional OCRCache database shared by all workers
+            engine: OCR engine name (default: config.OCR_CONFIG["engine"])
+            quantize: Int8 recognizer quantization per worker (see OCRHandler)
+            text_height_profile: Text height profile the workers resize to (see OCRHandler)
+            decode_mode: "color" or "reduced_gray", used by the workers and by
+                         load_image in this process (default: "color")
+            max_decode_side: Smallest longer side a reduced decode may produce
+                             (default: 2560)
+            frame_slots: Shared-memory slots for decoded arrays sent with
+                         submit_array (default: 2 per worker; 0 pickles arrays instead)
+            frame_slot_mb: Capacity of each slot in MB; larger frames are pickled
+                           (default: sized from the first array submitted)
+            frame_memory_mb: Cap on the ring's shared memory; fewer slots are
+                             created to stay under it (default: 48, below
+                             Docker's 64 MB /dev/shm)
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.torch_threads = torch_threads
+        self.languages = languages or ['en']
+        self.gpu = gpu
+        self.cache_path = cache_path
+        self.engine = engine
+        self.quantize = quantize
+        if text_height_profile is not None and text_height_profile not in TEXT_HEIGHT_PROFILES:
+            raise ValueError(f"Unknown text height profile: {text_height_profile}")
+        self.text_height_profile = text_height_profile
+        if decode_mode not in ("color", "reduced_gray"):
+            raise ValueError(f"Unknown decode mode: {decode_mode}")
+        self.decode_mode = decode_mode
+        self.max_decode_side = max_decode_side
+        self.frame_slots = 2 * self.workers if frame_slots is None else frame_slots
+        self.frame_slot_mb = frame_slot_mb
+        self.frame_memory_mb = frame_memory_mb
+        # Created on the first submit_array, once a frame size is known
+        self.frames: Optional[FrameRing] = None
+        self._frames_lock = threading.Lock()
+        self._frames_unavailable = not self.frame_slots
+        self._shutting_down = False
+
+        # Spawn keeps torch/OpenMP state from leaking into the children
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.languages, self.gpu, self.torch_threads, self.cache_path, self.engine, self.quantize,
+                      self.text_height_profile, self.decode_mode, self.max_decode_side)
+        )
+        logger.info(f"OCRPool started with {self.workers} workers")
+
+    @staticmethod
+    def _job_source(image_path):
+        """Paths travel as strings; encoded bytes are small enough to pickle."""
+        if isinstance(image_path, (bytes, bytearray, memoryview)):
+            return bytes(image_path)
+        return str(image_path)
+
+    def submit(self, image_path) -> Future:
+        """
+        Queue an image for OCR and return a future for (text, confidence).
+        Accepts a file path, encoded bytes or a decoded array (see submit_array).
+        """
+        if isinstance(image_path, np.ndarray):
+            return self.submit_array(image_path)
+        return self._executor.submit(_run_extract, self._job_source(image_path))
+
+    def extract_text_from_image(self, image_path) -> Tuple[str, float]:
+        """Extract text from an image file, encoded bytes or array using a pool worker."""
+        return self.submit(image_path).result()
+
+    def submit_array(self, image: np.ndarray) -> Future:
+        """
+        Queue a decoded array for OCR and return a future for (text, confidence).
+
+        The array is copied once into a FrameRing slot and the worker maps it
+        by handle; the slot is released when the future completes. Arrays that
+        do not fit a slot, or arrive while every slot is in flight, are pickled.
+        """
+        frames = self._frame_ring(image)
+        if frames is None or not frames.fits(image):
+            return self._executor.submit(_run_extract_array, image)
+        try:
+            # The ring is kept small, so a full ring must not stall the workers
+            handle = frames.put(image, timeout=0)
+        except TimeoutError:
+            return self._executor.submit(_run_extract_array, image)
+
+        try:
+            future = self._executor.submit(_run_extract_frame, handle)
+        except Exception:
+            frames.release(handle)
+            raise
+        future.add_done_callback(lambda _: self._release_frame(frames, handle))
+        return future
+
+    def _release_frame(self, frames: FrameRing, handle: FrameHandle):
+        """Done-callback: free a frame's slot, and close the ring after a non-waiting shutdown."""
+        frames.release(handle)
+        with self._frames_lock:
+            close = self._shutting_down and frames.in_use() == 0
+        if close:
+            frames.close()
+
+    def _frame_ring(self, image: np.ndarray) -> Optional[FrameRing]:
+        """
+        The FrameRing for submit_array, created on first use.
+
+        Slots default to the first frame's size plus headroom, and the slot
+        count is cut to fit frame_memory_mb. If not even one slot fits, or the
+        shared memory cannot be allocated, arrays are pickled instead.
+        """
+        with self._frames_lock:
+            if self.frames is not None or self._frames_unavailable or self._shutting_down:
+                return self.frames
+            megabyte = 1024 * 1024
+            slot_mb = self.frame_slot_mb or math.ceil(image.nbytes * 1.25 / megabyte)
+            slots = min(self.frame_slots, self.frame_memory_mb // slot_mb)
+            if slots < 1:
+                logger.info(f"{slot_mb} MB frame slots exceed frame_memory_mb={self.frame_memory_mb}; "
+                            f"pickling arrays")
+                self._frames_unavailable = True
+                return None
+            try:
+                self.frames = FrameRing(slots=slots, slot_bytes=slot_mb * megabyte)
+            except OSError as e:
+                logger.warning(f"Shared memory for {slots} x {slot_mb} MB frames unavailable, "
+                               f"pickling arrays: {str(e)}")
+                self._frames_unavailable = True
+            return self.frames
+
+    def extract_text_from_array(self, image: np.ndarray) -> Tuple[str, float]:
+        """Extract text from an already decoded array using a pool worker."""
+        return self.submit_array(image).result()
+
+    def extract_result(self, image_path) -> OCRResult:
+        """Structured OCR output (boxes in source coordinates) from a pool worker."""
+        if not isinstance(image_path, np.ndarray):
+            image_path = self._job_source(image_path)
+        return self._executor.submit(_run_extract_result, image_path).result()
+
+    def load_image(self, image_path) -> np.ndarray:
+        """
+        Decode an image file or encoded bytes in this process, for use with
+        submit_array. Honors decode_mode like the workers' own decode.
+        """
+        if isinstance(image_path, (bytes, bytearray, memoryview)):
+            image_bytes = bytes(image_path)
+            image_path = f"<{len(image_bytes)} bytes>"
+        else:
+            image_bytes = Path(image_path).read_bytes()
+        if self.decode_mode == "reduced_gray":
+            flag = reduced_grayscale_flag(image_bytes, self.max_decode_side)
+        else:
+            flag = cv2.IMREAD_COLOR
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flag)
+        if image is None:
+            raise ImageDecodeError(f"Failed to read image: {image_path}")
+        return image
+
+    def assess_quality(self, image_path) -> dict:
+        """Score image quality using a pool worker."""
+        if isinstance(image_path, np.ndarray):
+            return assess_image_quality(image_path)
+        return self._executor.submit(_run_assess_quality, self._job_source(image_path)).result()
+
+    def extract_text_many(self, image_paths: List[str]) -> List[Tuple[str, float]]:
+        """Extract text from several images in parallel, preserving order."""
+        futures = [self.submit(path) for path in image_paths]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Block until running jobs have finished (default: True)
+            cancel_pending: Drop jobs that have not started yet (default: False)
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+        with self._frames_lock:
+            self._shutting_down = True
+            frames = self.frames
+        # Without wait, jobs may still be reading their frames; the last
+        # frame's done-callback closes the ring instead
+        if frames is not None and (wait or frames.in_use() == 0):
+            frames.close()
+        logger.info("OCRPool shut down")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_pending=exc_type is not None)
@@ -0,0 +1,199 @@
+"""
+ONNX Runtime execution path for EasyOCR.
+Exports the CRAFT detector and CRNN recognizer to ONNX once, then runs them
+through onnxruntime while reusing EasyOCR's pre- and post-processing.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from ocr_engines import EasyOCREngine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = ".onnx_models"
+ONNX_OPSET = 17
+
+
+def _model_paths(model_dir: str, languages: List[str]) -> Dict[str, Path]:
+    model_dir = Path(model_dir)
+    return {
+        "detector": model_dir / "craft_detector.onnx",
+        "recognizer": model_dir / f"recognizer_{'-'.join(sorted(languages))}.onnx",
+    }
+
+
+def export_easyocr_onnx(model_dir: str = DEFAULT_MODEL_DIR, languages: List[str] = None) -> Dict[str, Path]:
+    """
+    Export EasyOCR's detector and recognizer to ONNX.
+
+    Steps :
+        1. Load an fp32 CPU reader (dynamically quantized modules cannot be exported)
+        2. Export CRAFT with dynamic batch, height and width
+        3. Export the recognizer with dynamic batch and width
+
+    Returns:
+        {"detector": path, "recognizer": path}
+    """
+    import easyocr
+    import torch
+
+    languages = languages or ['en']
+    paths = _model_paths(model_dir, languages)
+    paths["detector"].parent.mkdir(parents=True, exist_ok=True)
+
+    reader = easyocr.Reader(languages, gpu=False, verbose=False, quantize=False)
+
+    class DetectorOutput(torch.nn.Module):
+        """CRAFT returns (score maps, feature); only the score maps are used."""
+
+        def __init__(self, detector):
+            super().__init__()
+            self.detector = detector
+
+        def forward(self, x):
+            return self.detector(x)[0]
+
+    class MeanOverLastDim(torch.nn.Module):
+        """AdaptiveAvgPool2d((None, 1)) as a plain mean, which exports with dynamic width."""
+
+        def forward(self, x):
+            return x.mean(dim=3, keepdim=True)
+
+    class RecognizerOutput(torch.nn.Module):
+        """The recognizer's text argument is only used by attention decoders, not CTC."""
+
+        def __init__(self, recognizer):
+            super().__init__()
+            self.recognizer = recognizer
+
+        def forward(self, x):
+            return self.recognizer(x, None)
+
+    detector = DetectorOutput(reader.detector).eval()
+    torch.onnx.export(
+        detector,
+        torch.randn(1, 3, 640, 640),
+        str(paths["detector"]),
+        input_names=["image"],
+        output_names=["score"],
+        dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"},
+                      "score": {0: "batch", 1: "score_height", 2: "score_width"}},
+        opset_version=ONNX_OPSET
+    )
+    logger.info(f"Exported detector to {paths['detector']}")
+
+    recognizer = reader.recognizer
+    if hasattr(recognizer, "AdaptiveAvgPool"):
+        recognizer.AdaptiveAvgPool = MeanOverLastDim()
+    recognizer = RecognizerOutput(recognizer).eval()
+    torch.onnx.export(
+        recognizer,
+        torch.randn(1, 1, 64, 256),
+        str(paths["recognizer"]),
+        input_names=["image"],
+        output_names=["logits"],
+        dynamic_axes={"image": {0: "batch", 3: "width"}, "logits": {0: "batch", 1: "steps"}},
+        opset_version=ONNX_OPSET
+    )
+    logger.info(f"Exported recognizer to {paths['recognizer']}")
+    return paths
+
+
+class _OnnxModule:
+    """
+    Stand-in for a torch module inside EasyOCR's pipeline.
+    Accepts and returns torch tensors so EasyOCR's code runs unchanged.
+    """
+
+    def __init__(self, session, returns_feature: bool):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+        self.returns_feature = returns_feature
+
+    def __call__(self, x, *args):
+        import torch
+
+        output = self.session.run(None, {self.input_name: x.detach().cpu().numpy().astype(np.float32)})[0]
+        output = torch.from_numpy(output).to(x.device)
+        # The detector is unpacked as (y, feature); feature is unused downstream
+        return (output, None) if self.returns_feature else output
+
+    def eval(self):
+        return self
+
+    def to(self, *args, **kwargs):
+        return self
+
+
+class OnnxEasyOCREngine(EasyOCREngine):
+    """
+    EasyOCR with the detector and recognizer executed by onnxruntime.
+    Produces the same OCRResult contract as EasyOCREngine.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        languages: list = None,
+        gpu: bool = False,
+        model_dir: str = DEFAULT_MODEL_DIR,
+        intra_op_threads: int = None
+    ):
+        """
+        Args:
+            languages: List of EasyOCR language codes (default: ['en'])
+            gpu: Use the CUDA execution provider when available (default: False)
+            model_dir: Directory holding exported models; missing models are exported
+            intra_op_threads: onnxruntime intra-op thread count (default: runtime choice)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The onnx OCR engine needs onnxruntime. Install with: pip install onnxruntime") from e
+
+        self._ort = ort
+        self.model_dir = model_dir
+        self.intra_op_threads = intra_op_threads
+        self.providers = ["CPUExecutionProvider"]
+        if gpu and "CUDAExecutionProvider" in ort.get_available_providers():
+            self.providers.insert(0, "CUDAExecutionProvider")
+
+        # The fp32 reader supplies EasyOCR's pre/post-processing; its torch
+        # modules are replaced in _build_reader and released
+        super().__init__(languages=languages, gpu=False, reader_options={"quantize": False})
+        self.gpu = self.providers[0] == "CUDAExecutionProvider"
+        logger.info(f"ONNX OCR engine initialized with providers: {self.providers}")
+
+    def _reader_params(self) -> Dict:
+        params = super()._reader_params()
+        params.update(model_dir=self.model_dir, intra_op_threads=self.intra_op_threads, providers=self.providers)
+        return params
+
+    def _build_reader(self):
+        """Load the fp32 reader and swap its detector and recognizer for ONNX sessions."""
+        paths = _model_paths(self.model_dir, self.languages)
+        if not all(path.exists() for path in paths.values()):
+            logger.info(f"ONNX models not found in {self.model_dir}, exporting")
+            paths = export_easyocr_onnx(self.model_dir, self.languages)
+
+        reader = super()._build_reader()
+        options = self._ort.SessionOptions()
+        options.graph_optimization_level = self._ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+
+        reader.detector = _OnnxModule(
+            self._ort.InferenceSession(str(paths["detector"]), options, providers=self.providers),
+            returns_feature=True
+        )
+        reader.recognizer = _OnnxModule(
+            self._ort.InferenceSession(str(paths["recognizer"]), options, providers=self.providers),
+            returns_feature=False
+        )
+        return reader
@@ -0,0 +1,243 @@
+"""
+Streaming classification pipeline.
+Runs decode, OCR and LLM classification as separate stages connected by bounded queues.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream on a stage queue
+_DONE = object()
+
+# How often blocked queue operations re-check the stop event
+_POLL_SECONDS = 0.1
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put item on a bounded queue, giving up once stop is set. Returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _Stage:
+    """One pipeline stage: a pool of worker threads reading from a bounded queue."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict], None],
+        workers: int,
+        input_queue: queue.Queue,
+        stop: threading.Event
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.input_queue = input_queue
+        self.stop = stop
+        self.output_queue = None
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self, output_queue: queue.Queue, downstream_workers: int):
+        self.output_queue = output_queue
+        self._downstream_workers = downstream_workers
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self):
+        while not self.stop.is_set():
+            try:
+                item = self.input_queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+
+            # Items that already failed upstream pass straight through
+            if item["error"] is None:
+                started = time.perf_counter()
+                try:
+                    self.func(item)
+                except Exception as e:
+                    logger.warning(f"{self.name} stage failed for {item['image_path']}: {str(e)}")
+                    item["error"] = f"{self.name}: {str(e)}"
+                elapsed = time.perf_counter() - started
+                item["timings"][self.name] = elapsed
+                with self._lock:
+                    self.processed += 1
+                    self.busy_seconds += elapsed
+
+            if not _put(self.output_queue, item, self.stop):
+                return
+
+        # The last worker to finish forwards end-of-stream to every downstream worker
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            for _ in range(self._downstream_workers):
+                _put(self.output_queue, _DONE, self.stop)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            processed = self.processed
+            busy_seconds = self.busy_seconds
+        return {
+            "workers": self.workers,
+            "queue_depth": self.input_queue.qsize(),
+            "processed": processed,
+            "busy_seconds": busy_seconds,
+            # Items per second of worker time, scaled by the number of workers
+            "throughput": processed / busy_seconds * self.workers if busy_seconds else 0.0
+        }
+
+
+class ClassificationPipeline:
+    """
+    Producer/consumer pipeline around DocumentClassifier components.
+    Each stage has its own worker count and a bounded input queue, so a slow
+    LLM stage blocks the OCR and decode stages instead of letting decoded
+    images pile up in memory.
+    """
+
+    def __init__(
+        self,
+        classifier,
+        decode_workers: int = 2,
+        ocr_workers: int = 1,
+        llm_workers: int = 8,
+        queue_size: int = 8,
+        process_text: Callable[[str], Dict] = None
+    ):
+        """
+        Configure the pipeline.
+
+        Args:
+            classifier: DocumentClassifier providing ocr_handler and llm_classifier
+            decode_workers: Threads reading and decoding images (default: 2)
+            ocr_workers: Threads running OCR (default: 1)
+            llm_workers: Threads waiting on LLM calls (default: 8)
+            queue_size: Capacity of each inter-stage queue (default: 8)
+            process_text: Replaces classification in the LLM stage, e.g. schema
+                          extraction; called with the OCR text and its return
+                          value becomes the item's result (default: classify)
+        """
+        self.classifier = classifier
+        self.decode_workers = decode_workers
+        self.ocr_workers = ocr_workers
+        self.llm_workers = llm_workers
+        self.queue_size = queue_size
+        self.process_text = process_text
+        self._stages: List[_Stage] = []
+        self._started_at = None
+
+    def _decode(self, item: Dict):
+        item["image"] = self.classifier.ocr_handler.load_image(item["image_path"])
+
+    def _ocr(self, item: Dict):
+        image = item.pop("image")
+        item["text"], item["ocr_confidence"] = self.classifier.ocr_handler.extract_text_from_array(image)
+
+    def _classify(self, item: Dict):
+        text = item["text"]
+        if self.process_text is not None and text and text.strip():
+            item["result"] = self.process_text(text)
+            return
+        item["result"] = self.classifier.classify_ocr_text(text, item["ocr_confidence"])
+
+    def run(self, image_paths: Iterable[str]) -> Iterator[Dict]:
+        """
+        Stream classification results in completion order.
+
+        Steps :
+            1. Feed image paths into the decode queue
+            2. Decode -> OCR -> LLM stages run concurrently
+            3. Yield each finished item as soon as it leaves the LLM stage
+
+        Closing the generator early stops the stage threads. An exception raised
+        while iterating image_paths is re-raised here once the items fed before
+        it have been yielded.
+
+        Yields:
+            Dicts with image_path, result, error, ocr_confidence and per-stage timings
+        """
+        decode_queue = queue.Queue(maxsize=self.queue_size)
+        ocr_queue = queue.Queue(maxsize=self.queue_size)
+        llm_queue = queue.Queue(maxsize=self.queue_size)
+        output_queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        feed_errors = []
+
+        self._stages = [
+            _Stage("decode", self._decode, self.decode_workers, decode_queue, stop),
+            _Stage("ocr", self._ocr, self.ocr_workers, ocr_queue, stop),
+            _Stage("llm", self._classify, self.llm_workers, llm_queue, stop),
+        ]
+        self._stages[0].start(ocr_queue, self.ocr_workers)
+        self._stages[1].start(llm_queue, self.llm_workers)
+        self._stages[2].start(output_queue, 1)
+        self._started_at = time.perf_counter()
+
+        def feed():
+            try:
+                for image_path in image_paths:
+                    item = {
+                        "image_path": str(image_path),
+                        "result": None,
+                        "error": None,
+                        "ocr_confidence": 0.0,
+                        "timings": {}
+                    }
+                    if not _put(decode_queue, item, stop):
+                        return
+            except Exception as e:
+                logger.error(f"Reading image paths failed: {str(e)}")
+                feed_errors.append(e)
+            finally:
+                # End the stream even if image_paths raised, so run() does not hang
+                for _ in range(self.decode_workers):
+                    _put(decode_queue, _DONE, stop)
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+
+        try:
+            while True:
+                item = output_queue.get()
+                if item is _DONE:
+                    break
+                item.pop("image", None)
+                item.pop("text", None)
+                yield item
+        finally:
+            # Also runs when the caller abandons the generator
+            stop.set()
+
+        logger.info(f"Pipeline finished: {self.stats()}")
+        if feed_errors:
+            raise feed_errors[0]
+
+    def stats(self) -> Dict:
+        """Per-stage queue depth, processed count and throughput."""
+        stats = {stage.name: stage.stats() for stage in self._stages}
+        if self._started_at is not None and self._stages:
+            elapsed = time.perf_counter() - self._started_at
+            completed = self._stages[-1].processed
+            stats["overall_throughput"] = completed / elapsed if elapsed else 0.0
+        return stats
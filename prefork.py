@@ -0,0 +1,399 @@
+"""
+Pre-fork worker supervisor.
+Builds one fully initialized DocumentClassifier in the parent, then forks
+worker processes that inherit the loaded OCR weights and LLM client
+copy-on-write instead of loading them again.
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Deque, Dict, Iterable, Iterator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# DocumentClassifier methods a job may call
+ALLOWED_METHODS = ("classify_image", "classify_text", "extract_schema_from_text")
+
+
+def _prepare_child(classifier, torch_threads: int):
+    """Reset per-process state a forked worker must not share with the parent."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Locks may have been held by a parent thread at fork time
+    classifier._stats_lock = threading.Lock()
+    classifier._ocr_lock = threading.Lock()
+    classifier._ocr_executor = None
+    classifier.llm_classifier._llm_lock = threading.Lock()
+
+    # SQLite connections must not cross fork
+    for cache in (getattr(classifier.ocr_handler, "cache", None), classifier.llm_classifier.cache):
+        if cache is not None and hasattr(cache, "reopen"):
+            cache.reopen()
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(torch_threads)
+
+
+def _worker_main(classifier, jobs, results, max_jobs: int, torch_threads: int):
+    """
+    Serve jobs from this worker's own job pipe until max_jobs is reached or
+    the stop sentinel arrives. Nothing is shared with the other workers, so a
+    worker killed mid-read or mid-write cannot leave a lock held for them.
+    """
+    _prepare_child(classifier, torch_threads)
+    logger.info(f"Prefork worker {os.getpid()} ready (recycles after {max_jobs} jobs)")
+
+    for _ in range(max_jobs):
+        try:
+            job = jobs.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        job_id, method, args = job
+        try:
+            message = (job_id, getattr(classifier, method)(*args), None)
+        except Exception as e:
+            message = (job_id, None, e)
+        try:
+            results.send(message)
+        except Exception as e:
+            # The result or exception did not pickle; send() pickles before writing
+            results.send((job_id, None, RuntimeError(f"{type(e).__name__}: {str(e)}")))
+
+
+@dataclass
+class _Worker:
+    """Parent-side state for one forked worker."""
+
+    process: multiprocessing.Process
+    jobs: Connection  # parent -> worker
+    results: Connection  # worker -> parent
+    remaining: int  # jobs it will still accept before recycling
+    job_id: int = -1  # job it is running, -1 when idle
+
+
+class PreforkSupervisor:
+    """
+    Runs DocumentClassifier calls on forked workers that share the parent's
+    loaded models copy-on-write.
+
+    gc.freeze() is called before forking so the collector never writes to
+    the inherited objects (which would copy their pages into each worker).
+    Workers exit after max_jobs jobs and are replaced by a fresh fork of the
+    parent, which bounds memory growth from fragmentation and caches.
+    Each worker has its own job and result pipes, and the parent hands a job
+    to a worker only when it is idle.
+    Requires the fork start method (Linux/macOS).
+
+    Only the first workers are forked from a single-threaded parent; their
+    replacements are forked from the supervisor thread while caller threads
+    may be running. CPython resets its own locks (imports, logging) in the
+    child and _prepare_child replaces the classifier's, but a lock another
+    thread holds inside a C library at that moment stays held in the child.
+    Keep model inference out of the parent's other threads while workers are
+    running; the parent only dispatches jobs and collects results.
+    """
+
+    def __init__(
+        self,
+        classifier,
+        workers: int = 2,
+        max_jobs: int = 200,
+        max_jobs_jitter: int = 20,
+        torch_threads: int = 1
+    ):
+        """
+        Args:
+            classifier: DocumentClassifier built in this process; it is warmed up
+                        (OCR engine and LLM client loaded) before forking
+            workers: Number of worker processes (default: 2)
+            max_jobs: Jobs a worker serves before it is recycled (default: 200)
+            max_jobs_jitter: Random extra jobs per worker, so workers do not all
+                             recycle at once (default: 20)
+            torch_threads: Torch intra-op threads per worker (default: 1)
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("PreforkSupervisor needs the fork start method")
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1")
+
+        self.classifier = classifier
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.max_jobs_jitter = max_jobs_jitter
+        self.torch_threads = torch_threads
+
+        self._context = multiprocessing.get_context("fork")
+        self._workers: Dict[int, _Worker] = {}
+        self._queue: Deque[tuple] = deque()  # jobs waiting for an idle worker
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._next_job_id = 0
+        self._stopping = False
+        self._thread: threading.Thread = None
+        self.recycled = 0
+        self.crashed = 0
+        self.completed = 0
+
+    def start(self) -> "PreforkSupervisor":
+        """Warm up the classifier, freeze the heap and fork the workers."""
+        started = time.perf_counter()
+        self.classifier.warm_up()
+        gc.collect()
+        gc.freeze()
+        logger.info(f"Classifier warmed up in {time.perf_counter() - started:.1f}s; "
+                    f"{gc.get_freeze_count()} objects frozen")
+
+        # Fork before starting the supervisor thread, so the first workers
+        # start from a single-threaded parent (replacements do not; see the
+        # class docstring)
+        for _ in range(self.workers):
+            self._fork_worker()
+
+        self._thread = threading.Thread(target=self._supervise, name="prefork-supervisor", daemon=True)
+        self._thread.start()
+        logger.info(f"PreforkSupervisor started {self.workers} workers")
+        return self
+
+    def _fork_worker(self):
+        max_jobs = self.max_jobs + random.randint(0, self.max_jobs_jitter)
+        with self._lock:
+            # shutdown() snapshots the workers under this lock; a worker forked
+            # after that would never get the stop sentinel and the supervisor
+            # thread would wait for it forever
+            if self._stopping:
+                return
+            job_reader, job_writer = self._context.Pipe(duplex=False)
+            result_reader, result_writer = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_worker_main,
+                args=(self.classifier, job_reader, result_writer, max_jobs, self.torch_threads),
+                daemon=True
+            )
+            process.start()
+            # Keep only the parent's ends, so a dead worker shows up as EOF
+            job_reader.close()
+            result_writer.close()
+            self._workers[process.pid] = _Worker(process, job_writer, result_reader, max_jobs)
+        self._dispatch()
+
+    def _supervise(self, interval: float = 0.2):
+        """Collect results, reap exited workers and fork replacements."""
+        while True:
+            with self._lock:
+                if self._stopping and not self._workers:
+                    return
+                readers = {worker.results: pid for pid, worker in self._workers.items()}
+                sentinels = {worker.process.sentinel: pid for pid, worker in self._workers.items()}
+
+            ready = wait(list(readers) + list(sentinels), timeout=interval)
+            # Results first, so a worker's last result is handled before it is reaped
+            for pid in [readers[obj] for obj in ready if obj in readers]:
+                self._receive(pid)
+            for pid in [sentinels[obj] for obj in ready if obj in sentinels]:
+                self._reap(pid)
+
+    def _receive(self, pid: int):
+        """Resolve the future for every result waiting on a worker's pipe."""
+        with self._lock:
+            worker = self._workers.get(pid)
+        if worker is None:
+            return
+        while worker.results.poll():
+            try:
+                job_id, result, error = worker.results.recv()
+            except (EOFError, OSError):
+                # The worker exited; its sentinel reaps it
+                return
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+                worker.job_id = -1
+                self.completed += 1
+            if future is not None:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        self._dispatch()
+
+    def _reap(self, pid: int):
+        """Retire an exited worker, fail the job it died in and fork a replacement."""
+        self._receive(pid)
+        with self._lock:
+            worker = self._workers.pop(pid, None)
+            if worker is None:
+                return
+            job_id, worker.job_id = worker.job_id, -1
+        worker.process.join()
+        worker.jobs.close()
+        worker.results.close()
+
+        exitcode = worker.process.exitcode
+        if job_id >= 0:
+            self._fail_running_job(pid, exitcode, job_id)
+        with self._lock:
+            if self._stopping:
+                return
+            if exitcode == 0:
+                self.recycled += 1
+            else:
+                self.crashed += 1
+        if exitcode == 0:
+            logger.info(f"Prefork worker {pid} recycled")
+        elif job_id < 0:
+            logger.error(f"Prefork worker {pid} exited with code {exitcode} while idle")
+        self._fork_worker()
+
+    def _dispatch(self):
+        """Hand queued jobs to idle workers that still accept jobs."""
+        with self._lock:
+            if self._stopping:
+                return
+            assignments = []
+            for worker in self._workers.values():
+                if not self._queue:
+                    break
+                if worker.job_id < 0 and worker.remaining > 0:
+                    job = self._queue.popleft()
+                    worker.job_id = job[0]
+                    worker.remaining -= 1
+                    assignments.append((worker, job))
+
+        requeued = False
+        for worker, job in assignments:
+            try:
+                worker.jobs.send(job)
+            except OSError:
+                # The worker exited before the job reached it; retire it and let another take the job
+                with self._lock:
+                    worker.remaining = 0
+                    if worker.job_id == job[0]:
+                        worker.job_id = -1
+                        if job[0] in self._futures:
+                            self._queue.appendleft(job)
+                            requeued = True
+            except Exception as e:
+                # send() pickles before writing, so unpicklable arguments leave the pipe intact
+                with self._lock:
+                    future = self._futures.pop(job[0], None)
+                    worker.job_id = -1
+                    worker.remaining += 1
+                if future is not None:
+                    future.set_exception(e)
+        if requeued:
+            self._dispatch()
+
+    def _fail_running_job(self, pid: int, exitcode: int, job_id: int):
+        with self._lock:
+            future = self._futures.pop(job_id, None)
+        logger.error(f"Prefork worker {pid} exited with code {exitcode} during job {job_id}")
+        if future is not None:
+            future.set_exception(RuntimeError(f"Worker {pid} died with exit code {exitcode} during the job"))
+
+    def submit(self, method: str, *args) -> Future:
+        """
+        Queue a DocumentClassifier call on a worker.
+
+        Args:
+            method: One of ALLOWED_METHODS
+            *args: Picklable positional arguments (paths, bytes, text)
+
+        Returns:
+            Future for the method's return value
+        """
+        if method not in ALLOWED_METHODS:
+            raise ValueError(f"Unknown method: {method}. Available: {list(ALLOWED_METHODS)}")
+        if self._stopping or self._thread is None:
+            raise RuntimeError("PreforkSupervisor is not running")
+
+        future = Future()
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._futures[job_id] = future
+            self._queue.append((job_id, method, args))
+        self._dispatch()
+        return future
+
+    def classify_image(self, image_path) -> Dict:
+        """Classify an image file or encoded bytes on a worker."""
+        if not isinstance(image_path, (bytes, bytearray, memoryview)):
+            image_path = str(image_path)
+        else:
+            image_path = bytes(image_path)
+        return self.submit("classify_image", image_path).result()
+
+    def classify_text(self, text: str) -> Dict:
+        """Classify text on a worker."""
+        return self.submit("classify_text", text).result()
+
+    def map(self, method: str, items: Iterable) -> Iterator:
+        """Run method over items on the workers, yielding results in input order."""
+        futures = [self.submit(method, item) for item in items]
+        for future in futures:
+            yield future.result()
+
+    def stats(self) -> Dict:
+        """Worker, queue and recycling counters."""
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "pending": len(self._futures),
+                "queued": len(self._queue),
+                "running": sum(1 for worker in self._workers.values() if worker.job_id >= 0),
+                "completed": self.completed,
+                "recycled": self.recycled,
+                "crashed": self.crashed
+            }
+
+    def shutdown(self, timeout: float = 30.0):
+        """Stop the workers after their current job and fail any queued jobs."""
+        if self._stopping:
+            return
+        with self._lock:
+            self._stopping = True
+            workers = list(self._workers.values())
+
+        for worker in workers:
+            try:
+                worker.jobs.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                logger.warning(f"Prefork worker {worker.process.pid} did not stop, terminating")
+                worker.process.terminate()
+                worker.process.join()
+        # The supervisor thread delivers the last results and reaps every worker
+        if self._thread is not None:
+            self._thread.join()
+
+        with self._lock:
+            pending = list(self._futures.values())
+            self._futures.clear()
+            self._queue.clear()
+        for future in pending:
+            future.set_exception(RuntimeError("PreforkSupervisor shut down before the job ran"))
+        gc.unfreeze()
+        logger.info(f"PreforkSupervisor shut down: {self.stats()}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -0,0 +1,357 @@
+"""
+HTTP classification service.
+Stdlib ThreadingHTTPServer exposing POST /classify and POST /extract. Uploaded
+images are gathered into micro-batches for OCR; classification and extraction
+LLM calls then run concurrently on the request threads.
+
+Usage:
+    python server.py --port 8000 --max-batch 8 --max-wait-ms 25
+    curl --data-binary @"Bank Statement/82.jpg" http://localhost:8000/classify
+    curl --data-binary @"Salary Slip/102.jpg" "http://localhost:8000/extract?ocr_only=1"
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from ocr_handler import ImageDecodeError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 25 * 1024 * 1024
+
+# Stops the batcher thread
+_STOP = object()
+
+
+class BadRequestError(Exception):
+    """The request body is missing or unusable; answered with 400."""
+
+
+def _capture(function, *args):
+    """Call function, returning the exception instead of raising it."""
+    try:
+        return function(*args)
+    except Exception as e:
+        return e
+
+
+class MicroBatcher:
+    """
+    Collects OCR requests for up to max_wait_ms (or max_items) and runs them
+    through the handler's extract_text_batch in one call.
+    """
+
+    def __init__(self, ocr_handler, max_items: int = 8, max_wait_ms: float = 25.0):
+        """
+        Args:
+            ocr_handler: OCRHandler (batched) or OCRPool (one job per image)
+            max_items: Largest batch handed to OCR (default: 8)
+            max_wait_ms: How long the first image in a batch waits for company
+                         (default: 25 ms)
+        """
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+
+        self.ocr_handler = ocr_handler
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image_bytes: bytes) -> Future:
+        """Queue encoded image bytes; the future resolves to (text, confidence, batch_size)."""
+        future = Future()
+        self._queue.put((image_bytes, future))
+        return future
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.put(_STOP)
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch: List[Tuple[bytes, Future]]):
+        images = [image_bytes for image_bytes, _ in batch]
+        extract_batch = getattr(self.ocr_handler, "extract_text_batch", None)
+        if extract_batch is None:
+            outputs = self._process_each(images)
+        else:
+            try:
+                outputs = extract_batch(images, batch_size=self.max_items)
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} failed ({str(e)}), retrying images one by one")
+                outputs = self._process_each(images)
+
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+        for (_, future), output in zip(batch, outputs):
+            if isinstance(output, Exception):
+                future.set_exception(output)
+            else:
+                future.set_result((output[0], output[1], len(batch)))
+
+    def _process_each(self, images: List[bytes]) -> List:
+        """
+        OCR images individually; failures are returned in place of their result.
+        Handlers with submit (OCRPool) get every image queued before any result
+        is awaited, so the pool's workers run them in parallel.
+        """
+        submit = getattr(self.ocr_handler, "submit", None)
+        if submit is None:
+            return [_capture(self.ocr_handler.extract_text_from_image, image_bytes) for image_bytes in images]
+
+        futures = [_capture(submit, image_bytes) for image_bytes in images]
+        return [future if isinstance(future, Exception) else _capture(future.result) for future in futures]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+                "queue_depth": self._queue.qsize()
+            }
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+
+class ClassificationService:
+    """
+    Request handling behind the HTTP endpoints: quality gate, batched OCR,
+    then local tiers and a bounded number of concurrent LLM calls.
+    """
+
+    def __init__(self, classifier, max_batch: int = 8, max_wait_ms: float = 25.0, llm_concurrency: int = None):
+        """
+        Args:
+            classifier: DocumentClassifier providing OCR, local tiers and the LLM
+            max_batch: Largest OCR micro-batch (default: 8)
+            max_wait_ms: Max time an image waits for its batch to fill (default: 25 ms)
+            llm_concurrency: Max in-flight LLM calls (default: classifier.llm_concurrency)
+        """
+        self.classifier = classifier
+        self.batcher = MicroBatcher(classifier.ocr_handler, max_items=max_batch, max_wait_ms=max_wait_ms)
+        self._llm_slots = threading.BoundedSemaphore(llm_concurrency or classifier.llm_concurrency)
+        self._lock = threading.Lock()
+        self.requests = {"classify": 0, "extract": 0, "errors": 0}
+        self.started_at = time.time()
+
+    def _ocr(self, image_bytes: bytes, timings: Dict) -> Tuple[str, float, int]:
+        started = time.perf_counter()
+        text, confidence, batch_size = self.batcher.submit(image_bytes).result()
+        timings["ocr_ms"] = (time.perf_counter() - started) * 1000
+        return text, confidence, batch_size
+
+    def classify(self, image_bytes: bytes) -> Dict:
+        """Classify one uploaded image."""
+        timings = {}
+        rejected = self.classifier.check_quality(image_bytes)
+        if rejected is not None:
+            return {"result": rejected, "timings": timings}
+
+        text, ocr_confidence, batch_size = self._ocr(image_bytes, timings)
+        started = time.perf_counter()
+        result = self.classifier.classify_ocr_text(text, ocr_confidence, llm_slots=self._llm_slots)
+        timings["classify_ms"] = (time.perf_counter() - started) * 1000
+        return {"result": result, "batch_size": batch_size, "timings": timings}
+
+    def extract(self, image_bytes: bytes, ocr_only: bool = False) -> Dict:
+        """OCR one uploaded image and, unless ocr_only, extract its schema fields."""
+        timings = {}
+        text, ocr_confidence, batch_size = self._ocr(image_bytes, timings)
+        response = {"text": text, "ocr_confidence": ocr_confidence, "batch_size": batch_size, "timings": timings}
+        if ocr_only or not text.strip():
+            return response
+
+        started = time.perf_counter()
+        with self._llm_slots:
+            extraction = self.classifier.extract_schema_from_text(ocr_text=text)
+        timings["extract_ms"] = (time.perf_counter() - started) * 1000
+        response["extraction"] = extraction.model_dump()
+        return response
+
+    def count(self, key: str):
+        with self._lock:
+            self.requests[key] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = dict(self.requests)
+        return {
+            "uptime_s": time.time() - self.started_at,
+            "requests": requests,
+            "ocr_batching": self.batcher.stats(),
+            "routing": self.classifier.routing_report()
+        }
+
+    def close(self):
+        self.batcher.close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps HTTP requests onto the ClassificationService attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        raw_length = (self.headers.get("Content-Length") or "0").strip()
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            # The body's extent is unknown, so the connection cannot be reused
+            self.close_connection = True
+            raise BadRequestError(f"Invalid Content-Length: {raw_length!r}")
+        length = int(raw_length)
+        if length == 0:
+            raise BadRequestError("Request body must contain the image bytes")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise OverflowError(f"Image larger than {MAX_BODY_BYTES} bytes")
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, self.server.service.stats())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        service = self.server.service
+        if url.path not in ("/classify", "/extract"):
+            self._send_json(404, {"error": f"Unknown path: {url.path}"})
+            return
+
+        try:
+            image_bytes = self._read_body()
+            if url.path == "/classify":
+                service.count("classify")
+                payload = service.classify(image_bytes)
+            else:
+                service.count("extract")
+                ocr_only = parse_qs(url.query).get("ocr_only", ["0"])[0] in ("1", "true")
+                payload = service.extract(image_bytes, ocr_only=ocr_only)
+            self._send_json(200, payload)
+        except OverflowError as e:
+            service.count("errors")
+            self._send_json(413, {"error": str(e)})
+        except (BadRequestError, ImageDecodeError) as e:
+            # Empty body, bad Content-Length or bytes that do not decode as an image
+            service.count("errors")
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            service.count("errors")
+            logger.error(f"Error handling {url.path}: {str(e)}")
+            self._send_json(500, {"error": f"{type(e).__name__}: {str(e)}"})
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+def create_server(service: ClassificationService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """Build a ThreadingHTTPServer bound to host:port and serving service."""
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Port")
+    parser.add_argument("--max-batch", type=int, default=8, help="Max images per OCR batch")
+    parser.add_argument("--max-wait-ms", type=float, default=25.0, help="Max wait for a batch to fill")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="Max in-flight LLM calls")
+    parser.add_argument("--ocr-cache", action="store_true", help="Use the persistent OCR cache")
+    parser.add_argument("--llm-cache", action="store_true", help="Use the persistent LLM response cache")
+    parser.add_argument("--fast-path", action="store_true", help="Keyword fast path before the LLM")
+    parser.add_argument("--text-model", default=None, help="Saved TextModelClassifier to try before the LLM")
+    parser.add_argument("--quality-threshold", type=float, default=None, help="Reject scans below this score")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from classifier import DocumentClassifier
+
+    load_dotenv()
+    ocr_cache = None
+    llm_cache = None
+    if args.ocr_cache:
+        from ocr_cache import OCRCache
+        ocr_cache = OCRCache()
+    if args.llm_cache:
+        from llm_cache import LLMResponseCache
+        llm_cache = LLMResponseCache()
+
+    classifier = DocumentClassifier(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        ocr_cache=ocr_cache,
+        llm_cache=llm_cache,
+        llm_concurrency=args.llm_concurrency,
+        fast_path=args.fast_path,
+        text_model=args.text_model,
+        quality_threshold=args.quality_threshold
+    ).warm_up()
+    service = ClassificationService(
+        classifier,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        llm_concurrency=args.llm_concurrency
+    )
+    server = create_server(service, args.host, args.port)
+    logger.info(f"Serving on http://{args.host}:{args.port} (batch {args.max_batch}, wait {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        service.close()
+        classifier.close()
+
+
+if __name__ == "__main__":
+    main()
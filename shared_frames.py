@@ -0,0 +1,238 @@
+"""
+Shared-memory transport for decoded images.
+A FrameRing owns one multiprocessing.shared_memory segment split into fixed-size
+slots; the parent copies a decoded frame into a free slot once and passes a small
+FrameHandle to worker processes, which map the slot without another copy.
+"""
+
+import errno
+import logging
+import os
+import threading
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FrameHandle(NamedTuple):
+    """Picklable reference to a frame stored in a FrameRing slot."""
+
+    segment: str
+    slot: int
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+    generation: int
+
+
+def _unlink_segment(segment: shared_memory.SharedMemory):
+    """Finalizer: release a ring segment that was never closed explicitly."""
+    try:
+        segment.close()
+        segment.unlink()
+    except (BufferError, FileNotFoundError):
+        pass
+
+
+class FrameRing:
+    """
+    Fixed-size slot buffer in shared memory, written by one process and read by
+    worker processes.
+
+    Each put() claims a free slot and returns a FrameHandle; the slot stays
+    reserved until release() is called with that handle. Handles carry a slot
+    generation, so a stale or double release is detected instead of freeing a
+    slot that has since been reused. Slots still held at close() are reported
+    as leaks.
+    """
+
+    def __init__(self, slots: int = 8, slot_bytes: int = 32 * 1024 * 1024):
+        """
+        Create the shared memory segment.
+
+        Args:
+            slots: Number of frames that can be in flight at once (default: 8)
+            slot_bytes: Capacity of each slot; 32 MB fits a 3-channel
+                        3600x3000 uint8 page (default: 32 MB)
+        """
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        if slot_bytes < 1:
+            raise ValueError("slot_bytes must be positive")
+
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._segment = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self.name = self._segment.name
+        # Creating the segment only sets its size; reserve the pages now so a
+        # full /dev/shm fails here with OSError instead of SIGBUS on a later put()
+        fd = getattr(self._segment, "_fd", -1)
+        if fd >= 0 and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, slots * slot_bytes)
+            except OSError as e:
+                if e.errno in (errno.ENOSPC, errno.ENOMEM):
+                    _unlink_segment(self._segment)
+                    raise
+        self._free: List[int] = list(range(slots))
+        self._generations = [0] * slots
+        # slot -> (handle, allocated_at)
+        self._in_use: Dict[int, Tuple[FrameHandle, float]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.frames_written = 0
+        self.bytes_written = 0
+        self._finalizer = weakref.finalize(self, _unlink_segment, self._segment)
+        logger.info(f"FrameRing {self.name} created: {slots} slots x {slot_bytes / 1024 / 1024:.1f} MB")
+
+    def fits(self, image: np.ndarray) -> bool:
+        """Whether image is small enough for one slot."""
+        return image.nbytes <= self.slot_bytes
+
+    def put(self, image: np.ndarray, timeout: float = None) -> FrameHandle:
+        """
+        Copy image into a free slot.
+
+        Blocks while every slot is in use, which bounds the number of decoded
+        frames waiting on the workers.
+
+        Args:
+            image: Decoded image array
+            timeout: Seconds to wait for a free slot (default: wait forever)
+
+        Returns:
+            FrameHandle to pass to a worker; release it when the job is done
+        """
+        if not self.fits(image):
+            raise ValueError(f"Frame of {image.nbytes} bytes does not fit a {self.slot_bytes} byte slot")
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("FrameRing is closed")
+            if not self._condition.wait_for(lambda: self._free or self._closed, timeout=timeout):
+                raise TimeoutError(f"No free FrameRing slot after {timeout}s ({len(self._in_use)} in use)")
+            if self._closed:
+                raise RuntimeError("FrameRing is closed")
+            slot = self._free.pop()
+            self._generations[slot] += 1
+            handle = FrameHandle(
+                segment=self.name,
+                slot=slot,
+                offset=slot * self.slot_bytes,
+                shape=tuple(image.shape),
+                dtype=image.dtype.str,
+                generation=self._generations[slot]
+            )
+            self._in_use[slot] = (handle, time.monotonic())
+
+        # The slot is reserved, so the copy can run outside the lock
+        view = np.ndarray(image.shape, dtype=image.dtype, buffer=self._segment.buf, offset=handle.offset)
+        view[...] = image
+        del view
+        with self._condition:
+            self.frames_written += 1
+            self.bytes_written += image.nbytes
+        return handle
+
+    def release(self, handle: FrameHandle):
+        """Return a handle's slot to the free list."""
+        with self._condition:
+            held = self._in_use.get(handle.slot)
+            if handle.segment != self.name or held is None or held[0].generation != handle.generation:
+                raise ValueError(f"Stale or foreign FrameHandle released: {handle}")
+            del self._in_use[handle.slot]
+            self._free.append(handle.slot)
+            self._condition.notify()
+
+    def in_use(self) -> int:
+        """Number of slots currently held."""
+        with self._condition:
+            return len(self._in_use)
+
+    def leaks(self, max_age_seconds: float = 0.0) -> List[Dict]:
+        """
+        Handles held for longer than max_age_seconds.
+
+        Returns:
+            List of {"slot", "generation", "shape", "age_seconds"}
+        """
+        now = time.monotonic()
+        with self._condition:
+            held = list(self._in_use.values())
+        return [
+            {
+                "slot": handle.slot,
+                "generation": handle.generation,
+                "shape": handle.shape,
+                "age_seconds": now - allocated_at
+            }
+            for handle, allocated_at in held
+            if now - allocated_at >= max_age_seconds
+        ]
+
+    def stats(self) -> Dict:
+        """Slot usage and bytes moved through the ring."""
+        with self._condition:
+            return {
+                "slots": self.slots,
+                "slot_bytes": self.slot_bytes,
+                "in_use": len(self._in_use),
+                "frames_written": self.frames_written,
+                "bytes_written": self.bytes_written
+            }
+
+    def close(self):
+        """Unlink the segment, logging any handles that were never released."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        leaked = self.leaks()
+        if leaked:
+            logger.warning(f"FrameRing {self.name} closed with {len(leaked)} unreleased frame(s): "
+                           f"{[(leak['slot'], round(leak['age_seconds'], 1)) for leak in leaked]}")
+        self._finalizer()
+        logger.info(f"FrameRing {self.name} closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Segments attached by this (worker) process, by name
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach_frame(handle: FrameHandle) -> np.ndarray:
+    """
+    Map a frame in place from a worker process.
+
+    The returned array is a view into shared memory: it is only valid until
+    the owner releases the handle, so it must not be kept after the job.
+    """
+    segment = _attached.get(handle.segment)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=handle.segment)
+        _attached[handle.segment] = segment
+    return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=segment.buf, offset=handle.offset)
+
+
+def detach_all():
+    """Close this process's segment mappings (the owner unlinks them)."""
+    for name, segment in list(_attached.items()):
+        try:
+            segment.close()
+        except BufferError:
+            logger.warning(f"Shared frame segment {name} still has live views")
+            continue
+        del _attached[name]
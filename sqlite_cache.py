@@ -0,0 +1,34 @@
+"""
+SQLite connection handling shared by the persistent caches.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SQLiteCacheMixin:
+    """
+    One SQLite connection per cache, guarded by a lock and safe to reopen
+    in a forked child. Classes set self.db_path before calling _connect().
+    """
+
+    db_path: Path
+
+    def _connect(self):
+        """Open the connection (and the lock that serializes its use)."""
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+
+    def reopen(self):
+        """
+        Open a fresh connection in a forked child process.
+        SQLite connections must not be used across fork, so the inherited one
+        is abandoned rather than closed.
+        """
+        self._connect()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -15,6 +15,7 @@ import os
 from pathlib import Path
 from classifier import DocumentClassifier
 from evaluator import AccuracyMetric
+from llm_cache import LLMResponseCache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -36,7 +37,7 @@ def main_small_test():
     """
     logger.info("\nStep 1: Initializing DocumentClassifier...")
     api_key = os.getenv("OPENAI_API_KEY")
-    classifier = DocumentClassifier(api_key=api_key, ocr_gpu=False)
+    classifier = DocumentClassifier(api_key=api_key, ocr_gpu=False, llm_cache=LLMResponseCache())
     logger.info("Step 2: Initializing AccuracyMetric...")
     metric = AccuracyMetric(random_seed=42)
     logger.info("Step 3: Preparing test dataset (80/20 split)...")
@@ -53,6 +54,7 @@ def main_small_test():
 
     logger.info("\nStep 5: Running evaluation on 10 test images...")
     results = metric.evaluate(classifier, small_test_set)
+    logger.info(f"LLM cache stats: {classifier.llm_classifier.cache.stats()}")
     return results
 
 
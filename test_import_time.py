@@ -0,0 +1,27 @@
+"""
+Cold-start budget for importing the classifier package.
+Fails when `import classifier` takes longer than the budget or loads a heavy
+dependency (torch, easyocr, cv2, llama_index, ...) before it is needed.
+"""
+
+import os
+
+from benchmark import HEAVY_MODULES, measure_import_time
+
+# Override with IMPORT_TIME_BUDGET_MS on slow machines
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+
+
+def test_import_time(module: str = "classifier"):
+    """Import module in a fresh interpreter and check it against the budget."""
+    rows = measure_import_time(module)
+    total = next(row["cumulative_ms"] for row in rows if row["module"] == module and row["depth"] == 0)
+    eager = sorted({row["module"].split(".")[0] for row in rows} & set(HEAVY_MODULES))
+
+    print(f"import {module}: {total:.1f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    assert not eager, f"import {module} loaded heavy modules eagerly: {eager}"
+    assert total <= IMPORT_TIME_BUDGET_MS, f"import {module} took {total:.1f} ms, budget {IMPORT_TIME_BUDGET_MS:.0f} ms"
+
+
+if __name__ == "__main__":
+    test_import_time()
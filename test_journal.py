@@ -0,0 +1,55 @@
+"""
+Evaluation journal resume check.
+An interrupted evaluation leaves successful, errored and truncated entries in
+its journal; resuming must reuse the successes and re-run only the rest.
+Uses a stub classifier, so no OCR models or API key are needed.
+"""
+
+import tempfile
+from pathlib import Path
+
+from evaluator import AccuracyMetric, EvaluationJournal
+
+TEST_SET = [("a.jpg", "Check"), ("b.jpg", "Utility"), ("c.jpg", "Salary Slip")]
+
+
+class _StubClassifier:
+    """Labels images from TEST_SET and records which ones it was asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def classify_image(self, image_path):
+        self.calls.append(image_path)
+        return {"document_type": dict(TEST_SET)[image_path], "confidence": 1.0, "classified_by": "stub"}
+
+
+def test_journal_resume():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = Path(tmp) / "journal.jsonl"
+        journal = EvaluationJournal(str(journal_path))
+        journal.append("a.jpg", "Check", {"document_type": "Check"}, None, {})
+        journal.append("b.jpg", "Utility", None, "timeout", {})
+        # A run killed mid-write leaves a truncated last line
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"image_path": "c.jpg", "predic')
+
+        assert journal.load() == {"a.jpg": {"document_type": "Check"}}
+
+        classifier = _StubClassifier()
+        results = AccuracyMetric().evaluate(classifier, TEST_SET, journal_path=str(journal_path))
+
+        assert sorted(classifier.calls) == ["b.jpg", "c.jpg"], classifier.calls
+        assert results["accuracy"] == 1.0 and results["y_true"] == [label for _, label in TEST_SET]
+        assert set(journal.load()) == {"a.jpg", "b.jpg", "c.jpg"}
+
+        # A second resume has nothing left to run
+        classifier = _StubClassifier()
+        AccuracyMetric().evaluate(classifier, TEST_SET, journal_path=str(journal_path))
+        assert classifier.calls == [], classifier.calls
+    print("Journal resume re-ran only the unfinished images")
+
+
+if __name__ == "__main__":
+    test_journal_resume()
+    print("Journal checks passed")
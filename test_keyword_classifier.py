@@ -0,0 +1,41 @@
+"""
+Keyword fast path checks: a clear-cut document is labeled locally, while text
+that only shares generic words with a category falls through to the LLM.
+Runs on plain strings; needs no OCR models or API key.
+"""
+
+from keyword_classifier import KeywordClassifier
+
+BANK_STATEMENT = """
+STATEMENT OF ACCOUNT  Statement period: 01-Apr-2023 to 30-Apr-2023
+Opening balance 12,500.00
+Date  Transaction details  Withdrawals  Deposits  Balance
+Closing balance 18,200.00
+"""
+
+# Shares "debit", "deposits", "withdrawal", "memo" and "tan" with the
+# indicator lists but is none of the document types
+OFFICE_MEMO = """
+MEMO to all staff: the new tan leather chairs were paid by debit card.
+Deposits for the withdrawal of old furniture are refundable at the front desk.
+"""
+
+
+def test_clear_document_classified():
+    result = KeywordClassifier().classify(BANK_STATEMENT)
+    assert result is not None and result["document_type"] == "Bank Statement", result
+    print(f"Bank statement matched {result['key_indicators']}")
+
+
+def test_generic_text_falls_through():
+    classifier = KeywordClassifier()
+    assert classifier.classify(OFFICE_MEMO) is None, classifier.score(OFFICE_MEMO)
+    assert classifier.score("a tan envelope")["ITR_Form 16"] == []
+    assert classifier.score("TAN of the deductor")["ITR_Form 16"] == ["TAN"]
+    print("Generic text left for the LLM")
+
+
+if __name__ == "__main__":
+    test_clear_document_classified()
+    test_generic_text_falls_through()
+    print("Keyword classifier checks passed")
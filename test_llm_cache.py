@@ -0,0 +1,35 @@
+"""
+LLMResponseCache behavior check: entries expire after ttl_seconds and never
+expire with ttl_seconds=None. Uses a temporary SQLite file; needs no API key.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from llm_cache import LLMResponseCache
+
+
+def test_llm_cache_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(db_path=str(Path(tmp) / "llm.sqlite"), ttl_seconds=0.2)
+        cache.put("prompt", '{"document_type": "Check"}')
+        assert cache.get("prompt") == '{"document_type": "Check"}'
+
+        time.sleep(0.3)
+        assert cache.get("prompt") is None, "expired response served"
+        assert cache.stats()["entries"] == 0, "expired response not deleted"
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        cache.close()
+
+        cache = LLMResponseCache(db_path=str(Path(tmp) / "llm.sqlite"), ttl_seconds=None)
+        cache.put("prompt", "kept")
+        time.sleep(0.3)
+        assert cache.get("prompt") == "kept", "ttl_seconds=None expired an entry"
+        cache.close()
+    print("LLM cache expired entries after ttl_seconds")
+
+
+if __name__ == "__main__":
+    test_llm_cache_ttl()
+    print("LLM cache checks passed")
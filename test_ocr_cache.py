@@ -0,0 +1,36 @@
+"""
+OCRCache behavior check: least-recently-used eviction once the stored text
+exceeds max_size_bytes. Uses a temporary SQLite file; needs no OCR models.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from ocr_cache import OCRCache
+
+
+def test_ocr_cache_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = OCRCache(db_path=str(Path(tmp) / "ocr.sqlite"), max_size_bytes=10)
+        cache.put("a", "aaaa", 0.9)
+        time.sleep(0.01)
+        cache.put("b", "bbbb", 0.8)
+        time.sleep(0.01)
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get("a") == ("aaaa", 0.9)
+        time.sleep(0.01)
+        cache.put("c", "cccc", 0.7)
+
+        assert cache.get("b") is None, "least recently used entry survived eviction"
+        assert cache.get("a") == ("aaaa", 0.9)
+        assert cache.get("c") == ("cccc", 0.7)
+        stats = cache.stats()
+        assert stats["entries"] == 2 and stats["size_bytes"] <= 10, stats
+        cache.close()
+    print("OCR cache evicted the least recently used entry")
+
+
+if __name__ == "__main__":
+    test_ocr_cache_lru_eviction()
+    print("OCR cache checks passed")
@@ -0,0 +1,90 @@
+"""
+PreforkSupervisor checks: recycling after max_jobs, a worker exiting mid-job,
+and shutdown with jobs still queued. Uses a stub classifier, so no OCR models
+or API key are needed; skipped where the fork start method is unavailable.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import wait
+from types import SimpleNamespace
+
+from prefork import PreforkSupervisor
+
+HAS_FORK = "fork" in multiprocessing.get_all_start_methods()
+
+
+class _StubClassifier:
+    """Answers classify_text with the worker's pid; "exit" kills the worker."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.llm_classifier = SimpleNamespace(cache=None)
+        self.ocr_handler = None
+
+    def warm_up(self):
+        return self
+
+    def classify_text(self, text):
+        if text == "exit":
+            os._exit(3)
+        time.sleep(self.delay)
+        return {"text": text, "pid": os.getpid()}
+
+
+def test_recycling():
+    with PreforkSupervisor(_StubClassifier(), workers=2, max_jobs=3, max_jobs_jitter=0) as supervisor:
+        results = list(supervisor.map("classify_text", [str(i) for i in range(12)]))
+        assert [result["text"] for result in results] == [str(i) for i in range(12)]
+        # 12 jobs at 3 per worker need 4 worker lifetimes
+        assert len({result["pid"] for result in results}) >= 4, results
+        time.sleep(0.5)
+        stats = supervisor.stats()
+        assert stats["recycled"] >= 2 and stats["crashed"] == 0, stats
+        assert stats["workers"] == 2, stats
+    print(f"Workers recycled after max_jobs: {stats}")
+
+
+def test_worker_exit_mid_job():
+    with PreforkSupervisor(_StubClassifier(), workers=1, max_jobs=50) as supervisor:
+        try:
+            supervisor.classify_text("exit")
+        except RuntimeError as e:
+            assert "exit code 3" in str(e), e
+        else:
+            raise AssertionError("job of a worker that exited did not fail")
+
+        # The replacement worker serves the next job
+        assert supervisor.classify_text("after")["text"] == "after"
+        assert supervisor.stats()["crashed"] == 1, supervisor.stats()
+    print("Job failed with RuntimeError when its worker exited")
+
+
+def test_shutdown_with_queued_jobs():
+    supervisor = PreforkSupervisor(_StubClassifier(delay=0.5), workers=1, max_jobs=50).start()
+    futures = [supervisor.submit("classify_text", str(i)) for i in range(4)]
+    time.sleep(0.2)
+
+    started = time.perf_counter()
+    supervisor.shutdown(timeout=5)
+    assert time.perf_counter() - started < 5, "shutdown waited on queued jobs"
+    done, _ = wait(futures, timeout=1)
+    assert len(done) == len(futures), "shutdown left futures unresolved"
+
+    # The running job finishes; the queued ones fail
+    assert futures[0].result()["text"] == "0"
+    for future in futures[1:]:
+        assert isinstance(future.exception(), RuntimeError), future.exception()
+    assert supervisor.stats()["workers"] == 0, supervisor.stats()
+    print("Shutdown finished the running job and failed the queued ones")
+
+
+if __name__ == "__main__":
+    if not HAS_FORK:
+        print("Skipped: the fork start method is not available")
+    else:
+        test_recycling()
+        test_worker_exit_mid_job()
+        test_shutdown_with_queued_jobs()
+        print("Prefork checks passed")
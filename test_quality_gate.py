@@ -0,0 +1,84 @@
+"""
+Quality gate check on real dataset files.
+Runs OCRHandler.assess_quality on a JPEG, a WebP and a PNG (by path, as bytes
+and as a decoded array), and checks the calibrated threshold against the
+README-listed unreadable scans; it needs OpenCV but no OCR models or API key.
+"""
+
+from pathlib import Path
+
+import cv2
+
+from config import QUALITY_CONFIG
+from ocr_handler import ImageDecodeError, OCRHandler
+
+BASE_PATH = Path(__file__).parent
+# Check/1.jpg is a JPEG (reduced decode), Bank Statement/1.jpg is WebP and
+# Salary Slip/1.jpg is PNG despite their extensions (full-size fallback)
+SAMPLE_IMAGES = ["Check/1.jpg", "Bank Statement/1.jpg", "Salary Slip/1.jpg"]
+
+# Scans listed under README Limitations; Utility/91 is crisp and high-contrast,
+# so no image statistic flags it
+UNREADABLE = {
+    "Bank Statement": ["2", "98"],
+    "Check": ["1", "3", "4", "81", "83", "88"],
+    "ITR_Form 16": ["12", "14"],
+    "Salary Slip": ["43", "101"],
+    "Utility": ["1"],
+}
+READABLE = ["Bank Statement/3.jpg", "Check/6.jpg", "ITR_Form 16/2.jpg", "Salary Slip/2.jpg", "Utility/3.jpg"]
+
+
+def test_assess_quality():
+    for name in SAMPLE_IMAGES:
+        image_path = BASE_PATH / name
+        from_path = OCRHandler.assess_quality(str(image_path))
+        from_bytes = OCRHandler.assess_quality(image_path.read_bytes())
+        from_array = OCRHandler.assess_quality(cv2.imread(str(image_path)))
+
+        for quality in (from_path, from_bytes, from_array):
+            assert 0.0 <= quality["score"] <= 1.0, quality
+        assert from_path == from_bytes, (name, from_path, from_bytes)
+        print(f"{name}: score {from_path['score']:.2f}")
+
+
+def test_listed_scans_rejected():
+    threshold = QUALITY_CONFIG["min_score"]
+    for folder, stems in UNREADABLE.items():
+        for stem in stems:
+            score = OCRHandler.assess_quality(str(BASE_PATH / folder / f"{stem}.jpg"))["score"]
+            assert score < threshold, f"{folder}/{stem} scored {score:.2f}, above {threshold}"
+    for name in READABLE:
+        score = OCRHandler.assess_quality(str(BASE_PATH / name))["score"]
+        assert score >= threshold, f"{name} scored {score:.2f}, below {threshold}"
+
+    # The gate trades some readable scans for catching the listed ones; keep
+    # that share bounded when the calibration changes
+    listed = {(folder, stem) for folder, stems in UNREADABLE.items() for stem in stems} | {("Utility", "91")}
+    scores = []
+    for folder in UNREADABLE:
+        for image_path in sorted((BASE_PATH / folder).glob("*.jpg")):
+            if (folder, image_path.stem) in listed:
+                continue
+            try:
+                scores.append(OCRHandler.assess_quality(str(image_path))["score"])
+            except ImageDecodeError:
+                continue
+    passed = sum(score >= threshold for score in scores) / len(scores)
+    assert passed >= 0.75, f"only {passed:.0%} of readable scans pass the gate"
+    print(f"Listed scans rejected; {passed:.0%} of {len(scores)} readable scans pass")
+
+
+def test_undecodable_bytes():
+    try:
+        OCRHandler.assess_quality(b"not an image")
+    except ValueError:
+        return
+    raise AssertionError("assess_quality accepted bytes that are not an image")
+
+
+if __name__ == "__main__":
+    test_assess_quality()
+    test_listed_scans_rejected()
+    test_undecodable_bytes()
+    print("Quality gate checks passed")
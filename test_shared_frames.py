@@ -0,0 +1,117 @@
+"""
+FrameRing behavior checks: generation-checked release, leak reporting,
+cleanup at close and failing up front when shared memory is short. Runs
+in-process; needs no OCR models or API key.
+"""
+
+import logging
+import os
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from shared_frames import FrameRing, attach_frame, detach_all
+
+
+class _Records(logging.Handler):
+    """Collects log records so a test can inspect warnings."""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _expect(error, function, *args):
+    try:
+        function(*args)
+    except error:
+        return
+    raise AssertionError(f"{function.__name__}{args} did not raise {error.__name__}")
+
+
+def test_release_checks_generation():
+    image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    with FrameRing(slots=1, slot_bytes=64) as ring:
+        first = ring.put(image)
+        assert np.array_equal(attach_frame(first), image)
+        ring.release(first)
+
+        # The only slot is reused with a new generation
+        second = ring.put(image + 1)
+        assert second.slot == first.slot and second.generation == first.generation + 1
+        _expect(ValueError, ring.release, first)
+        assert ring.in_use() == 1, "a stale release freed a reused slot"
+
+        _expect(ValueError, ring.release, second._replace(segment="not-this-ring"))
+        ring.release(second)
+        _expect(ValueError, ring.release, second)
+        assert ring.in_use() == 0
+        detach_all()
+    print("Stale, foreign and double releases rejected")
+
+
+def test_leak_reporting():
+    with FrameRing(slots=2, slot_bytes=64) as ring:
+        held = ring.put(np.zeros((2, 5), dtype=np.uint8))
+        released = ring.put(np.zeros(4, dtype=np.uint8))
+        ring.release(released)
+
+        leaks = ring.leaks()
+        assert [leak["slot"] for leak in leaks] == [held.slot], leaks
+        assert leaks[0]["shape"] == (2, 5) and leaks[0]["generation"] == held.generation
+        assert ring.leaks(max_age_seconds=3600) == [], "fresh handle reported as an old leak"
+        assert ring.stats()["in_use"] == 1 and ring.stats()["frames_written"] == 2
+    print("Unreleased handle reported as a leak")
+
+
+def test_close_cleanup():
+    records = _Records()
+    logging.getLogger("shared_frames").addHandler(records)
+    try:
+        ring = FrameRing(slots=1, slot_bytes=64)
+        ring.put(np.ones(8, dtype=np.uint8))
+
+        # A writer waiting for a slot is woken by close instead of hanging
+        errors = []
+        def wait_for_slot():
+            try:
+                ring.put(np.ones(8, dtype=np.uint8))
+            except RuntimeError as e:
+                errors.append(e)
+        waiter = threading.Thread(target=wait_for_slot)
+        waiter.start()
+
+        ring.close()
+        waiter.join(timeout=5)
+        assert not waiter.is_alive() and len(errors) == 1, "blocked put() not released by close()"
+        assert any("1 unreleased frame" in message for message in records.messages), records.messages
+        _expect(FileNotFoundError, shared_memory.SharedMemory, ring.name)
+        _expect(RuntimeError, ring.put, np.ones(8, dtype=np.uint8))
+        ring.close()
+    finally:
+        logging.getLogger("shared_frames").removeHandler(records)
+    print("close() logged the leak, woke waiters and unlinked the segment")
+
+
+def test_allocation_failure():
+    if not hasattr(os, "posix_fallocate"):
+        print("Skipped allocation failure check (no posix_fallocate)")
+        return
+    before = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    # Far more than any /dev/shm holds: must fail up front, not on a later put()
+    _expect(OSError, FrameRing, 1, 1 << 40)
+    after = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    assert after <= before, f"failed ring left segments behind: {after - before}"
+    print("Oversized ring failed at creation and left no segment")
+
+
+if __name__ == "__main__":
+    test_release_checks_generation()
+    test_leak_reporting()
+    test_close_cleanup()
+    test_allocation_failure()
+    print("Shared frame checks passed")
@@ -0,0 +1,173 @@
+"""
+Trainable local text classifier.
+TF-IDF features with a linear model, used as a first tier ahead of the LLM.
+scikit-learn and joblib are imported when a model is built or loaded.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TextModelClassifier:
+    """
+    TF-IDF + logistic regression classifier over OCR text.
+    Only returns a prediction when the top class probability clears the
+    confidence threshold and leads the runner-up by the required margin.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.8, min_margin: float = 0.3):
+        """
+        Initialize text model classifier.
+
+        Args:
+            confidence_threshold: Minimum top-class probability (default: 0.8)
+            min_margin: Minimum gap between top two probabilities (default: 0.3)
+        """
+        self.confidence_threshold = confidence_threshold
+        self.min_margin = min_margin
+        self.model = None
+
+    @staticmethod
+    def _build_model():
+        """Word and character n-gram TF-IDF features into a linear model."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import FeatureUnion, Pipeline
+
+        features = FeatureUnion([
+            ("words", TfidfVectorizer(lowercase=True, ngram_range=(1, 2), min_df=2, sublinear_tf=True)),
+            # Character n-grams tolerate OCR misspellings of the indicator phrases
+            ("chars", TfidfVectorizer(lowercase=True, analyzer="char_wb", ngram_range=(3, 5),
+                                      min_df=2, sublinear_tf=True)),
+        ])
+        return Pipeline([
+            ("features", features),
+            ("classifier", LogisticRegression(max_iter=2000, C=10.0, class_weight="balanced")),
+        ])
+
+    def train(self, texts: List[str], labels: List[str]) -> "TextModelClassifier":
+        """Fit the model on OCR texts and their document types."""
+        if len(texts) != len(labels):
+            raise ValueError("texts and labels must have the same length")
+        if len(set(labels)) < 2:
+            raise ValueError("Training data needs at least two document types")
+
+        self.model = self._build_model()
+        self.model.fit(texts, labels)
+        logger.info(f"Text model trained on {len(texts)} documents, classes: {list(self.model.classes_)}")
+        return self
+
+    def train_from_dataset(self, dataset: List[Tuple[str, str]], ocr_handler) -> "TextModelClassifier":
+        """
+        OCR a labeled dataset and train on the result.
+        Pair with an OCRHandler that has an OCRCache so repeated training runs
+        reuse the stored OCR text.
+
+        Args:
+            dataset: List of (image_path, label) tuples
+            ocr_handler: OCRHandler (or OCRPool) used to extract text
+        """
+        texts, labels = [], []
+        for image_path, label in dataset:
+            try:
+                text, _ = ocr_handler.extract_text_from_image(image_path=image_path)
+            except Exception as e:
+                logger.warning(f"Skipping {image_path} during training: {str(e)}")
+                continue
+            if text and text.strip():
+                texts.append(text)
+                labels.append(label)
+        return self.train(texts, labels)
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Return {document_type: probability} for text."""
+        if self.model is None:
+            raise RuntimeError("Text model is not trained or loaded")
+        probabilities = self.model.predict_proba([text])[0]
+        return {label: float(p) for label, p in zip(self.model.classes_, probabilities)}
+
+    def classify(self, text: str) -> Optional[Dict]:
+        """
+        Classify text if the model is confident enough.
+
+        Returns:
+            Result dict in the same shape as the LLM output, or None for low-margin documents
+        """
+        if not text or not text.strip():
+            return None
+
+        probabilities = self.predict_proba(text)
+        ranked = sorted(probabilities.items(), key=lambda item: item[1], reverse=True)
+        (winner, top), (runner_up, second) = ranked[0], ranked[1]
+
+        if top < self.confidence_threshold or top - second < self.min_margin:
+            return None
+
+        return {
+            "document_type": winner,
+            "confidence": top,
+            "reasoning": f"Local text model predicted {winner} with probability {top:.2f} "
+                         f"(next: {runner_up} at {second:.2f})",
+            "key_indicators": self._top_terms(text, winner),
+            "negative_indicators": [],
+            "classified_by": "text_model"
+        }
+
+    def _top_terms(self, text: str, label: str, limit: int = 5) -> List[str]:
+        """Word features in text that push most strongly towards label."""
+        features = self.model.named_steps["features"]
+        classifier = self.model.named_steps["classifier"]
+        word_vectorizer = dict(features.transformer_list)["words"]
+
+        row = word_vectorizer.transform([text])
+        class_index = list(classifier.classes_).index(label)
+        if classifier.coef_.shape[0] > 1:
+            coefficients = classifier.coef_[class_index]
+        else:
+            # Binary models store one row, pointing towards classes_[1]
+            coefficients = classifier.coef_[0] if class_index == 1 else -classifier.coef_[0]
+        word_coefficients = coefficients[:row.shape[1]]
+
+        contributions = row.multiply(word_coefficients).toarray()[0]
+        names = word_vectorizer.get_feature_names_out()
+        top = np.argsort(contributions)[::-1][:limit]
+        return [names[idx] for idx in top if contributions[idx] > 0]
+
+    def save(self, path: str):
+        """Persist the trained model with joblib."""
+        if self.model is None:
+            raise RuntimeError("Text model is not trained")
+        import joblib
+        joblib.dump(
+            {
+                "model": self.model,
+                "confidence_threshold": self.confidence_threshold,
+                "min_margin": self.min_margin
+            },
+            path
+        )
+        logger.info(f"Text model saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, confidence_threshold: float = None, min_margin: float = None) -> "TextModelClassifier":
+        """Load a model saved with save(), optionally overriding its thresholds."""
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Text model not found: {path}")
+
+        import joblib
+        payload = joblib.load(path)
+        instance = cls(
+            confidence_threshold=confidence_threshold if confidence_threshold is not None
+            else payload["confidence_threshold"],
+            min_margin=min_margin if min_margin is not None else payload["min_margin"]
+        )
+        instance.model = payload["model"]
+        logger.info(f"Text model loaded from {path}")
+        return instance
@@ -0,0 +1,40 @@
+"""
+Train the local TF-IDF text model on the train split of the dataset folders.
+
+The split matches AccuracyMetric.prepare_test_dataset, so test_evaluator.py
+can evaluate the model on images it has not seen. OCR output is cached, so
+re-training after the first run does not re-OCR the corpus.
+"""
+
+import logging
+from pathlib import Path
+from evaluator import AccuracyMetric
+from ocr_cache import OCRCache
+from ocr_handler import OCRHandler
+from text_model import TextModelClassifier
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = "text_model.joblib"
+
+
+def main():
+    """
+    Steps :
+        Step 1: Split the dataset folders 80/20.
+        Step 2: OCR the train split (through the OCR cache).
+        Step 3: Fit and save the text model.
+    """
+    base_path = Path(__file__).parent
+    metric = AccuracyMetric(random_seed=42)
+    metric.prepare_test_dataset(base_path, test_percentage=0.2)
+    logger.info(f"Training on {len(metric.train_set)} images")
+
+    ocr_handler = OCRHandler(languages=['en'], gpu=False, cache=OCRCache())
+    model = TextModelClassifier().train_from_dataset(metric.train_set, ocr_handler)
+    model.save(MODEL_PATH)
+
+
+if __name__ == "__main__":
+    main()